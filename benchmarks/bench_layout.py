@@ -0,0 +1,275 @@
+"""
+bench_layout.py
+18. October 2026
+
+layout and rendering benchmarks for synthetic widget trees
+
+usage:
+    python benchmarks/bench_layout.py --sizes 10,100,1000 --output results.json
+
+Author:
+Nilusink
+"""
+import os
+import sys
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from pginter.widgets import Frame
+from pginter.types import Absolute, Pack, Grid, TOP
+from pginter import PgRoot
+import pygame as pg
+import typing as tp
+import tracemalloc
+import subprocess
+import argparse
+import platform
+import json
+import math
+import time
+
+
+WINDOW_SIZE: tuple[int, int] = (1920, 1080)
+DEFAULT_SIZES: tuple[int, ...] = (10, 100, 1_000, 10_000, 100_000)
+DEEP_CHAIN_LENGTH: int = 40  # nesting depth of the "deep" trees
+
+
+# tree builders, each one adds about `n` frames to the root and returns them
+def build_flat(root: PgRoot, n: int) -> list[Frame]:
+    """
+    one absolute container with `n` tiles
+    """
+    root.set_layout(Absolute)
+    per_row = WINDOW_SIZE[0] // 10
+
+    frames = []
+    for i in range(n):
+        frame = Frame(root, width=8, height=8)
+        frame.place((i % per_row) * 10, (i // per_row) * 10 % WINDOW_SIZE[1])
+        frames.append(frame)
+
+    return frames
+
+
+def build_deep(root: PgRoot, n: int) -> list[Frame]:
+    """
+    chains of nested pack containers
+    """
+    root.set_layout(Absolute)
+    depth = min(n, DEEP_CHAIN_LENGTH)
+
+    frames = []
+    for chain in range(math.ceil(n / depth)):
+        parent = Frame(root, layout=Pack, margin=1)
+        parent.place((chain * 12) % WINDOW_SIZE[0], (chain * 12) // WINDOW_SIZE[0] * 12 % WINDOW_SIZE[1])
+        frames.append(parent)
+
+        for _ in range(depth - 2):
+            child = Frame(parent, layout=Pack, margin=1)
+            child.pack(TOP)
+            frames.append(child)
+            parent = child
+
+        leaf = Frame(parent, width=4, height=4)
+        leaf.pack(TOP)
+        frames.append(leaf)
+
+    return frames
+
+
+def build_grid(root: PgRoot, n: int) -> list[Frame]:
+    """
+    one big weighted grid
+    """
+    root.set_layout(Grid)
+    columns = math.ceil(math.sqrt(n))
+    rows = math.ceil(n / columns)
+
+    root.grid_columnconfigure(range(columns), weight=1)
+    root.grid_rowconfigure(range(rows), weight=1)
+
+    frames = []
+    for i in range(n):
+        frame = Frame(root)
+        frame.grid(i // columns, i % columns, sticky="nsew")
+        frames.append(frame)
+
+    return frames
+
+
+def build_mixed(root: PgRoot, n: int) -> list[Frame]:
+    """
+    a grid of pack panels, each one containing rows of small grids
+    (100 frames per panel)
+    """
+    root.set_layout(Grid)
+    panels = math.ceil(n / 100)
+    columns = math.ceil(math.sqrt(panels))
+
+    root.grid_columnconfigure(range(columns), weight=1)
+    root.grid_rowconfigure(range(math.ceil(panels / columns)), weight=1)
+
+    frames = []
+    for p in range(panels):
+        panel = Frame(root, layout=Pack, margin=2, padding=1)
+        panel.grid(p // columns, p % columns, sticky="nsew", margin=2)
+        frames.append(panel)
+
+        for _ in range(9):
+            row = Frame(panel, layout=Grid, width=40, height=12)
+            row.grid_columnconfigure(range(10), weight=1)
+            row.grid_rowconfigure(0, weight=1)
+            row.pack(TOP)
+            frames.append(row)
+
+            for c in range(10):
+                tile = Frame(row, width=3, height=3)
+                tile.grid(0, c)
+                frames.append(tile)
+
+    return frames
+
+
+SHAPES: dict[str, tp.Callable[[PgRoot, int], list[Frame]]] = {
+    "flat": build_flat,
+    "deep": build_deep,
+    "grid": build_grid,
+    "mixed": build_mixed,
+}
+
+
+def _timed(func: tp.Callable, *args) -> tuple[float, tp.Any]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def run_case(shape: str, n: int) -> dict[str, tp.Any]:
+    """
+    benchmark one tree shape at one size
+    """
+    root = PgRoot(size=WINDOW_SIZE, headless=True)
+    builder = SHAPES[shape]
+
+    construct, frames = _timed(builder, root, n)
+    layout_cold, _ = _timed(root.calculate_geometry)
+    layout_idle, _ = _timed(root.calculate_geometry)
+
+    # invalidate every widget, like a theme change would
+    for frame in frames:
+        frame.invalidate_layout()
+
+    layout_full, _ = _timed(root.calculate_geometry)
+
+    root.update_screen()
+    draw_cold = root.stats.last["draw"] / 1000
+
+    # change a single widget
+    frames[-1].configure()
+    root.update_screen()
+    draw_single = root.stats.last["draw"] / 1000
+    layout_single = root.stats.last["layout"] / 1000
+
+    root.update_screen()
+    frame_idle = root.stats.last["frame"] / 1000
+
+    return {
+        "shape": shape,
+        "size": n,
+        "widgets": len(frames),
+        "construct_s": construct,
+        "layout_cold_s": layout_cold,
+        "layout_idle_s": layout_idle,
+        "layout_full_s": layout_full,
+        "layout_single_s": layout_single,
+        "draw_cold_s": draw_cold,
+        "draw_single_s": draw_single,
+        "frame_idle_s": frame_idle,
+    }
+
+
+def measure_memory(shape: str, n: int) -> int:
+    """
+    peak memory (in bytes) of building, laying out and drawing a tree
+    """
+    tracemalloc.start()
+
+    root = PgRoot(size=WINDOW_SIZE, headless=True)
+    SHAPES[shape](root, n)
+    root.update_screen()
+
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes",
+        default=",".join([str(size) for size in DEFAULT_SIZES]),
+        help="comma separated widget counts",
+    )
+    parser.add_argument(
+        "--shapes",
+        default=",".join(SHAPES),
+        help=f"comma separated tree shapes ({', '.join(SHAPES)})",
+    )
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slow) peak memory measurement")
+    parser.add_argument("--output", default="-", help="where to write the JSON results (- for stdout)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    shapes = args.shapes.split(",")
+
+    results = []
+    for shape in shapes:
+        for n in sizes:
+            result = run_case(shape, n)
+
+            if not args.no_memory:
+                result["peak_memory_bytes"] = measure_memory(shape, n)
+
+            results.append(result)
+            print(
+                f"{shape:>6} {n:>7}: layout {result['layout_cold_s'] * 1000:9.2f}ms "
+                f"draw {result['draw_cold_s'] * 1000:9.2f}ms",
+                file=sys.stderr,
+            )
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "pygame": pg.version.ver,
+        "platform": platform.platform(),
+        "window_size": WINDOW_SIZE,
+        "results": results,
+    }
+
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+
+    else:
+        with open(args.output, "w") as out:
+            json.dump(report, out, indent=2)
+
+
+if __name__ == "__main__":
+    main()
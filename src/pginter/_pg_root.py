@@ -7,26 +7,121 @@ the root of the window
 Author:
 Nilusink
 """
-from .widgets import GeometryManager
+from .widgets import GeometryManager, Frame
+from .utils import merge_rects
 from .theme import ThemeManager
-from copy import deepcopy
 from .types import *
+from collections import deque
 import typing as tp
 import pygame as pg
+import contextlib
+import threading
+import asyncio
+import warnings
 import os.path
+import math
+import heapq
+import time
 
 
 DEFAULT_TITLE: str = "Window"
 DEFAULT_ICON: str = os.path.dirname(__file__) + "/icon.png"
+WHEEL_BUTTONS: tuple[int, ...] = (4, 5)  # pygame reports scrolling as button presses too
+WAKE_EVENT: int = pg.event.custom_type()  # wakes an idle mainloop when something was posted
+IDLE_POLL_INTERVAL: int = 10  # how often (ms) an idle `run` loop checks for events
+
+# which pygame events are needed for which mouse events (see `Frame.bind`)
+EVENT_SOURCES: dict[int, tuple[str, ...]] = {
+    pg.MOUSEMOTION: (MOTION, DRAG, ENTER, LEAVE),
+    pg.MOUSEBUTTONDOWN: (PRESS, RELEASE, CLICK, DRAG),
+    pg.MOUSEBUTTONUP: (PRESS, RELEASE, CLICK, DRAG),
+    pg.MOUSEWHEEL: (WHEEL,),
+    pg.WINDOWLEAVE: (ENTER, LEAVE),
+}
+
+# input no widget can bind to, blocked so it doesn't fill the queue or wake an idle loop
+UNUSED_EVENTS: tuple[int, ...] = (
+    pg.KEYDOWN, pg.KEYUP, pg.TEXTINPUT, pg.TEXTEDITING,
+    pg.JOYAXISMOTION, pg.JOYBALLMOTION, pg.JOYHATMOTION, pg.JOYBUTTONDOWN, pg.JOYBUTTONUP,
+    pg.CONTROLLERAXISMOTION, pg.CONTROLLERBUTTONDOWN, pg.CONTROLLERBUTTONUP,
+    pg.FINGERDOWN, pg.FINGERUP, pg.FINGERMOTION, pg.MULTIGESTURE,
+)
+
+
+def _coalesce_events(events: tp.Iterable[pg.event.Event]) -> list[pg.event.Event]:
+    """
+    merge consecutive mouse motions into one (adding up their relative
+    motion) and drop all but the last resize
+    """
+    events = list(events)
+    resizes = sum(event.type == pg.VIDEORESIZE for event in events)
+    merged: list[pg.event.Event] = []
+
+    for event in events:
+        match event.type:
+            case pg.MOUSEMOTION if merged and merged[-1].type == pg.MOUSEMOTION:
+                rel_x, rel_y = merged[-1].rel
+                merged[-1] = pg.event.Event(
+                    pg.MOUSEMOTION,
+                    {**event.dict, "rel": (rel_x + event.rel[0], rel_y + event.rel[1])}
+                )
+                continue
+
+            case pg.VIDEORESIZE:
+                resizes -= 1
+
+                if resizes:
+                    continue
+
+        merged.append(event)
+
+    return merged
 
 
 class PgRoot(GeometryManager):
     _running: bool = True
     _theme: ThemeManager = ...
     __background: pg.Surface = ...
-    layout_params: BetterDict = ...
-    _min_size: tuple[int, int] = ...
     _bg_configured: bool = False
+    _damage_tracking: bool = True
+    _damage_threshold: float = .5
+    _full_redraw: bool = True
+    _children_moved: bool = False
+    _damaged_widgets: set[tp.Any] = ...
+    _damage_rects: list[pg.Rect] = ...
+    _child_rects: dict[tp.Any, pg.Rect] = ...
+    _clock: pg.time.Clock = ...
+    _fps: int = 60
+    _vsync: bool = False
+    _idle: bool = False
+    _timers: list[tuple[int, int, tp.Callable, tuple]] = ...
+    _cancelled_timers: set[int] = ...
+    _last_timer_id: int = 0
+    _stats: FrameStats = ...
+    _frame_callback: tp.Callable[[FrameStats], None] | None = None
+    _events_time: float = 0
+    _headless: bool = False
+    _title: str = DEFAULT_TITLE
+    _theme_watch_interval: int | None = None
+    _theme_watch_timer: int | None = None
+    _batch_depth: int = 0
+    _hovered: tuple[Frame, ...] = ()  # the widget under the cursor and its ancestors
+    _grab: Frame | None = None  # the widget a button was pressed on (receives DRAG and RELEASE)
+    _grab_button: int = 0
+    _filter_events: bool = True
+    _bound_events: dict[str, int] = ...  # how many callbacks are bound to each mouse event
+    _resize_delay: int = 100
+    _resize_interval: int = 500
+    _resize_preview: bool = True
+    _resize_size: tuple[int, int] | None = None  # the size the window is being resized to
+    _resize_since: int = 0
+    _resize_timer: int | None = None
+    _preview: pg.Surface | None = None  # the last frame, scaled while resizing
+    _preview_shown: bool = False
+    _capture_preview: bool = True
+    _posted: deque[tuple[tp.Callable, tuple, dict[str, tp.Any]]] = ...
+    _wake_lock: threading.Lock = ...
+    _wake_pending: bool = False  # a WAKE_EVENT has been posted since the last frame
 
     def __init__(
             self,
@@ -36,53 +131,346 @@ class PgRoot(GeometryManager):
             bg_color: Color = ...,
             padding: int = 0,
             margin: int = 0,
+            damage_tracking: bool = True,
+            damage_threshold: float = .5,
+            fps: int = 60,
+            vsync: bool = False,
+            idle: bool = False,
+            headless: bool = False,
+            filter_events: bool = True,
+            resize_delay: int = 100,
+            resize_interval: int = 500,
+            resize_preview: bool = True,
     ):
-        super().__init__()
+        """
+        :param damage_tracking: only redraw the parts of the screen that changed
+        :param damage_threshold: if more than this fraction of the window changed,
+            the whole window is redrawn instead
+        :param fps: maximum frames per second of the mainloop (0 means uncapped)
+        :param vsync: pace the mainloop by the displays refresh rate (the frame
+            cap is kept in case the driver ignores it, so `fps` should be at least
+            the refresh rate). The window content is scaled instead of laid out
+            again when resized
+        :param idle: sleep until an event arrives or a timer is due if nothing changed
+        :param headless: render to an in-memory surface of `size` instead of a window
+            (frames are advanced with `step`)
+        :param filter_events: don't let pygame queue events no widget listens to
+        :param resize_delay: only lay out the window again once its size hasn't
+            changed for this long (in milliseconds, 0 lays out on every resize)
+        :param resize_interval: while the window keeps being resized, still lay
+            it out this often (in milliseconds)
+        :param resize_preview: show the last frame scaled to the new size until
+            the window is laid out again
+        """
+        super().__init__(margin=margin, padding=padding)
+        self._stats = FrameStats()
+        self._fps = fps
+        self._idle = idle
+        self._timers = []
+        self._cancelled_timers = set()
+        self._damage_tracking = damage_tracking
+        self._damage_threshold = damage_threshold
+        self._damaged_widgets = set()
+        self._damage_rects = []
+        self._child_rects = {}
         self._theme = ThemeManager()
-        self._theme.notify_on(ThemeManager.NotifyEvent.theme_reload, self.notify)
         self._min_size = (0, 0)
+        self._bound_events = {}
+        self._posted = deque()
+        self._wake_lock = threading.Lock()
+        self._filter_events = filter_events
+        self._resize_delay = resize_delay
+        self._resize_interval = resize_interval
+        self._resize_preview = resize_preview and not headless
 
         # args
         self._bg_configured = bg_color is not ...
+        self._theme.notify_on(
+            ThemeManager.NotifyEvent.theme_reload,
+            self.notify,
+            keys=() if self._bg_configured else ("root.bg",)
+        )
         self._bg = self._theme.root.bg.hex if bg_color is ... else bg_color
 
-        self._layout_params = BetterDict({
-            "padding": padding,
-            "margin": margin,
-        })
-
         # pg init
+        self._headless = headless
+        if headless:
+            # no display server required
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
         pg.init()
         pg.font.init()
 
-        if size is not ...:
-            self.__background = pg.display.set_mode(size, flags=pg.RESIZABLE)
+        self._clock = pg.time.Clock()
+        size = (0, 0) if size is ... else size
+
+        if headless:
+            if size == (0, 0):
+                raise ValueError("a headless root needs a size")
+
+            self.__background = pg.Surface(size)
+            self._title = DEFAULT_TITLE if title is ... else title
 
         else:
-            self.__background = pg.display.set_mode(flags=pg.RESIZABLE)
+            self._open_window(size, vsync)
+
+            # set icon and caption
+            pg.display.set_caption(DEFAULT_TITLE if title is ... else title)
+            img = pg.image.load(DEFAULT_ICON if icon_path is ... else icon_path, "icon")
+            pg.display.set_icon(img)
 
-        # set icon and caption
-        pg.display.set_caption(DEFAULT_TITLE if title is ... else title)
-        img = pg.image.load(DEFAULT_ICON if icon_path is ... else icon_path, "icon")
-        pg.display.set_icon(img)
+        if filter_events:
+            pg.event.set_blocked(list(UNUSED_EVENTS))
+            self._update_event_filter()
+
+    def _open_window(self, size: tuple[int, int], vsync: bool) -> None:
+        """
+        create the pygame window
+        """
+        if vsync:
+            # pygame ignores vsync unless the window is drawn by a renderer
+            # (SCALED), which then also scales the window content when resized
+            try:
+                self.__background = pg.display.set_mode(size, flags=pg.RESIZABLE | pg.SCALED, vsync=1)
+                self._vsync = True
+                return
+
+            # not every renderer supports vsync, fall back to the frame cap
+            except pg.error:
+                pass
+
+        self.__background = pg.display.set_mode(size, flags=pg.RESIZABLE)
 
     # config
     @property
     def title(self) -> str:
+        if self._headless:
+            return self._title
+
         return pg.display.get_caption()[0]
 
     @title.setter
     def title(self, value: str) -> None:
+        if self._headless:
+            self._title = value
+            return
+
         pg.display.set_caption(value)
 
+    @property
+    def headless(self) -> bool:
+        return self._headless
+
+    @property
+    def surface(self) -> pg.Surface:
+        """
+        the surface everything is drawn to (the window or the headless buffer)
+        """
+        return self.__background
+
     @property
     def theme(self) -> ThemeManager:
         return self._theme
 
+    @property
+    def fps(self) -> int:
+        """
+        maximum frames per second of the mainloop (0 means uncapped)
+        """
+        return self._fps
+
+    @fps.setter
+    def fps(self, value: int) -> None:
+        self._fps = value
+
+    @property
+    def idle(self) -> bool:
+        """
+        if true, the mainloop sleeps while nothing changes
+        """
+        return self._idle
+
+    @idle.setter
+    def idle(self, value: bool) -> None:
+        self._idle = value
+
+    @property
+    def stats(self) -> FrameStats:
+        """
+        timings and counters of the last frames
+        """
+        return self._stats
+
+    @property
+    def frame_callback(self) -> tp.Callable[[FrameStats], None] | None:
+        """
+        called with `stats` after every frame
+        """
+        return self._frame_callback
+
+    @frame_callback.setter
+    def frame_callback(self, value: tp.Callable[[FrameStats], None] | None) -> None:
+        self._frame_callback = value
+
+    @property
+    def needs_update(self) -> bool:
+        """
+        true if the next `update_screen` would change anything
+        """
+        return self._layout_dirty \
+            or self._full_redraw \
+            or self._children_moved \
+            or len(self._damaged_widgets) > 0 \
+            or len(self._damage_rects) > 0 \
+            or (self._resize_size is not None and not self._preview_shown) \
+            or len(self._posted) > 0
+
+    # batching
+    @contextlib.contextmanager
+    def batch(self) -> tp.Iterator["PgRoot"]:
+        """
+        update many widgets at once
+
+        while a batch is open nothing is laid out or drawn, so the screen never
+        shows a half-updated tree. When the outermost batch exits, the layout
+        and the damaged areas are calculated once for all changes and the
+        screen is updated.
+
+        works as context manager (`with root.batch(): ...`) and as
+        decorator (`@root.batch()`), batches can be nested
+        """
+        self._batch_depth += 1
+
+        try:
+            yield self
+
+        finally:
+            self._batch_depth -= 1
+
+            if self._batch_depth == 0:
+                self.update_screen()
+
+    @property
+    def in_batch(self) -> bool:
+        """
+        true while a batch is open
+        """
+        return self._batch_depth > 0
+
+    # threads
+    def post(self, callback: tp.Callable, *args, **kwargs) -> None:
+        """
+        call `callback` (with `args` and `kwargs`) from the mainloop
+
+        safe to call from any thread (widgets may only be changed by the thread
+        running the mainloop, ex. `root.post(label.configure, width=10)`).
+        Everything posted is applied together at the start of the next frame,
+        before the layout is calculated.
+        """
+        self._posted.append((callback, args, kwargs))
+
+        # the first change since the last frame wakes up an idle mainloop
+        with self._wake_lock:
+            if self._wake_pending:
+                return
+
+            self._wake_pending = True
+
+        pg.event.post(pg.event.Event(WAKE_EVENT))
+
+    def _run_posted(self) -> None:
+        """
+        apply everything posted since the last frame as one batch
+        """
+        # (before counting, so changes posted after this wake the loop again)
+        with self._wake_lock:
+            self._wake_pending = False
+
+        # only what was there when the frame started, so producers can't stall it
+        count = len(self._posted)
+
+        if count == 0:
+            return
+
+        self._batch_depth += 1
+
+        try:
+            for _ in range(count):
+                callback, args, kwargs = self._posted.popleft()
+                callback(*args, **kwargs)
+
+        finally:
+            self._batch_depth -= 1
+
+    # timers
+    def after(self, ms: int, callback: tp.Callable, *args) -> int:
+        """
+        call `callback` (with `args`) from the mainloop after `ms` milliseconds
+
+        :return: the timers id (for `after_cancel`)
+        """
+        self._last_timer_id += 1
+        heapq.heappush(self._timers, (pg.time.get_ticks() + ms, self._last_timer_id, callback, args))
+
+        return self._last_timer_id
+
+    def after_cancel(self, timer_id: int) -> None:
+        """
+        cancel a timer created by `after`
+        """
+        self._cancelled_timers.add(timer_id)
+
+    def watch_theme(self, interval: int | None = 500) -> None:
+        """
+        check the theme file for changes and reload it while the mainloop runs
+
+        :param interval: how often to check (in milliseconds), None stops watching
+        """
+        if self._theme_watch_timer is not None:
+            self.after_cancel(self._theme_watch_timer)
+            self._theme_watch_timer = None
+
+        self._theme_watch_interval = interval
+
+        if interval is not None:
+            self._theme_watch_timer = self.after(interval, self._poll_theme)
+
+    def _poll_theme(self) -> None:
+        """
+        check the theme file for changes (re-schedules itself)
+        """
+        # a broken theme must neither stop the mainloop nor the watcher
+        try:
+            self._theme.check_for_changes()
+
+        except Exception as error:
+            warnings.warn(f"couldn't apply the reloaded theme: {error!r}")
+
+        finally:
+            self._theme_watch_timer = self.after(self._theme_watch_interval, self._poll_theme)
+
+    def _run_timers(self) -> None:
+        """
+        call all timers that are due
+        """
+        now = pg.time.get_ticks()
+
+        while self._timers and self._timers[0][0] <= now:
+            _due, timer_id, callback, args = heapq.heappop(self._timers)
+
+            if timer_id in self._cancelled_timers:
+                self._cancelled_timers.discard(timer_id)
+                continue
+
+            callback(*args)
+
     # interfacing
-    def notify(self, event: ThemeManager.NotifyEvent) -> None:
+    def notify(self, event: ThemeManager.NotifyEvent, changed: tp.Collection[str] = ...) -> None:
         """
         gets called by another class
+
+        :param event: what happened
+        :param changed: which theme values changed (defaults to all of them)
         """
         match event:
             case ThemeManager.NotifyEvent.theme_reload:
@@ -90,341 +478,523 @@ class PgRoot(GeometryManager):
                 if not self._bg_configured:
                     self._bg = self.theme.root.bg.rgba
 
+                self.invalidate_layout()
+                self._full_redraw = True
+
+    def invalidate_render(self) -> None:
+        """
+        the top-level children may have been moved or resized
+        """
+        self._children_moved = True
+
+    def report_damage(self, widget: tp.Any) -> None:
+        """
+        tell the root that the screen area of `widget` has to be redrawn
+        """
+        self._damaged_widgets.add(widget)
+
+    def report_area(self, rect: tuple[int, int, int, int]) -> None:
+        """
+        redraw a part of the screen
+        """
+        self._damage_rects.append(pg.Rect(rect))
+
+    def child_moved(self, child: tp.Any) -> None:
+        """
+        a top-level child moved or changed its size
+        """
+        super().child_moved(child)
+        self._children_moved = True
+
+    def remove_child(self, child: tp.Any) -> tp.Any:
+        """
+        remove a top-level child (the area it covered gets redrawn)
+        """
+        params = super().remove_child(child)
+
+        old_rect = self._child_rects.pop(child, None)
+        if old_rect is not None:
+            self.invalidate_area(old_rect)
+
+        self._damaged_widgets.discard(child)
+
+        return params
+
+    def invalidate_area(self, rect: pg.Rect) -> None:
+        """
+        redraw the given part of the screen on the next update
+        """
+        self._damage_rects.append(pg.Rect(rect))
+
+    def report_binding(self, event: str, count: int) -> None:
+        """
+        keep track of which mouse events are bound somewhere in the window
+        """
+        before = self._bound_events.get(event, 0)
+        after = before + count
+
+        if after > 0:
+            self._bound_events[event] = after
+
+        else:
+            self._bound_events.pop(event, None)
+
+        # only the first and the last binding of an event change the filter
+        if self._filter_events and (before > 0) != (after > 0):
+            self._update_event_filter()
+
+    def _update_event_filter(self) -> None:
+        """
+        only let pygame queue the mouse events some widget listens to
+        """
+        allowed, blocked = [], []
+
+        for source, events in EVENT_SOURCES.items():
+            # (leaving the window is also used to keep the resize preview up to date)
+            if any(event in self._bound_events for event in events) \
+                    or (source == pg.WINDOWLEAVE and self._resize_preview):
+                allowed.append(source)
+
+            else:
+                blocked.append(source)
+
+        if allowed:
+            pg.event.set_allowed(allowed)
+
+        if blocked:
+            pg.event.set_blocked(blocked)
+
     # pygame stuff
-    def _event_handler(self) -> None:
+    def _event_handler(self, events: tp.Iterable[pg.event.Event] = ...) -> None:
         """
         handle the events raised by pygame
+
+        :param events: the events to handle (defaults to the whole event queue)
         """
-        for event in pg.event.get():
+        for event in _coalesce_events(pg.event.get() if events is ... else events):
             match event.type:
                 case pg.QUIT:
                     self._running = False
 
-                # case pg.VIDEORESIZE:  # window size changed
-                #     width, height = event.size
-                #
-                #     print("updating size: ", (width, height), "\t", self._min_size)
-                #
-                #     width = max([width, self._min_size[0]])
-                #     height = max([height, self._min_size[1]])
-                #
-                #     # self.__background = pg.display.set_mode((width, height), flags=pg.RESIZABLE | pg.HWSURFACE | pg.DOUBLEBUF)
+                case pg.VIDEORESIZE:
+                    self._resize(event.size)
 
-    def update_screen(self) -> None:
+                case pg.MOUSEMOTION:
+                    self._mouse_motion(event.pos, event.rel)
+
+                case pg.MOUSEBUTTONDOWN | pg.MOUSEBUTTONUP if event.button not in WHEEL_BUTTONS:
+                    self._mouse_button(event.pos, event.button, event.type == pg.MOUSEBUTTONDOWN)
+
+                case pg.MOUSEWHEEL:
+                    self._mouse_wheel((event.x, event.y))
+
+                case pg.WINDOWLEAVE:
+                    self._set_hovered(None, (-1, -1))
+
+                    # the cursor leaves the window to grab its border, so this
+                    # is the last chance to keep the current frame for the preview
+                    if self._resize_preview and self._resize_size is None:
+                        self._preview = self.__background.copy()
+
+    # resizing
+    def _resize(self, size: tuple[int, int]) -> None:
         """
-        update the screen
+        the window is being resized, lay it out again once its size stopped
+        changing (showing a scaled preview in the meantime)
         """
-        self.__background.fill(self._bg)
+        # the renderer scales the frame to the window
+        if self._vsync:
+            self._full_redraw = True
+            return
 
-        self.calculate_geometry()
-        for child, params in self._child_params:
-            child.draw(self.__background)
+        if self._resize_delay <= 0 or self._headless:
+            self._resize_size = size
+            self._apply_resize()
+            return
+
+        now = pg.time.get_ticks()
+
+        if self._resize_size is None:
+            self._resize_since = now
+
+        self._resize_size = size
+        self._preview_shown = False
+
+        # debounce, but don't wait for longer than `resize_interval` in total
+        if self._resize_timer is not None:
+            self.after_cancel(self._resize_timer)
+
+        delay = min(self._resize_delay, self._resize_since + self._resize_interval - now)
+        self._resize_timer = self.after(max(delay, 0), self._apply_resize)
+
+    def _apply_resize(self) -> None:
+        """
+        resize the window (to at least the minimal size of its content) and
+        lay it out again
+        """
+        width, height = self._resize_size
+        self._resize_size = None
+        self._resize_timer = None
+
+        width = max(width, math.ceil(self._min_size[0]))
+        height = max(height, math.ceil(self._min_size[1]))
+
+        if not self._headless and (width, height) != pg.display.get_window_size():
+            self._open_window((width, height), self._vsync)
+
+        # the available space changed, so the whole layout has to be redone
+        self.invalidate_layout()
+        self._full_redraw = True
+        self._capture_preview = self._resize_preview
+
+    def _show_preview(self) -> None:
+        """
+        scale the last frame to the current window size
+        """
+        if self._preview_shown:
+            return
+
+        self._preview_shown = True
+
+        # nothing to scale yet, keep what's on the screen
+        if self._preview is None:
+            return
 
+        pg.transform.scale(self._preview, self.__background.get_size(), self.__background)
         pg.display.flip()
 
-    def update(self) -> None:
+    # mouse events
+    def _mouse_motion(self, pos: tuple[int, int], rel: tuple[int, int]) -> None:
         """
-        update events
+        update the hovered widget and send MOTION (or DRAG while a button is held)
         """
-        self._event_handler()
+        target = self.widget_at(*pos)
+        self._set_hovered(target, pos)
 
-    def mainloop(self):
+        if self._grab is not None and self._is_attached(self._grab):
+            self._dispatch(DRAG, self._grab, pos, button=self._grab_button, rel=rel)
+
+        else:
+            self._dispatch(MOTION, target, pos, rel=rel)
+
+    def _mouse_button(self, pos: tuple[int, int], button: int, pressed: bool) -> None:
         """
-        run the windows main loop
+        send PRESS, RELEASE and CLICK (if released on the widget it was pressed on)
         """
-        while self._running:
-            self.update()
-            self.update_screen()
+        target = self.widget_at(*pos)
+        self._set_hovered(target, pos)
 
-    def calculate_geometry(self):
+        if pressed:
+            self._dispatch(PRESS, target, pos, button=button)
+
+            if self._grab is None:
+                self._grab = target
+                self._grab_button = button
+
+            return
+
+        grab = self._grab
+        if button == self._grab_button:
+            self._grab = None
+
+        if grab is not None and not self._is_attached(grab):
+            grab = None
+
+        self._dispatch(RELEASE, target if grab is None else grab, pos, button=button)
+
+        if grab is not None and grab is target:
+            self._dispatch(CLICK, target, pos, button=button)
+
+    def _mouse_wheel(self, wheel: tuple[int, int]) -> None:
         """
-        calculate how each individual child should be placed
+        send WHEEL to the widget under the cursor
         """
-        match self._layout:
-            case 0:  # Absolute
-                # since the positioning is absolute, the children should not influence the parents size
-                for child, params in self._child_params:
-                    child.set_position(params.x, params.y)
+        # (motion events may be filtered, so the hovered widget can't be used)
+        pos = pg.mouse.get_pos()
+        self._dispatch(WHEEL, self.widget_at(*pos), pos, wheel=wheel)
 
-                return
+    def _set_hovered(self, target: Frame | None, pos: tuple[int, int]) -> None:
+        """
+        send LEAVE to the widgets the cursor left and ENTER to the ones it entered
+        """
+        if self._hovered and self._hovered[0] is target:
+            return
 
-            case 1:
-                directional_dict: dict[str, int | list] = {"total_x": 0, "total_y": 0, "children": [], "sizes": []}
-                top = deepcopy(directional_dict)
-                bottom = deepcopy(directional_dict)
-                left = deepcopy(directional_dict)
-                right = deepcopy(directional_dict)
-
-                # get all sizes and group by anchor
-                for child, param in self._child_params:
-                    child_size = child.calculate_size()
-
-                    if param.anchor == TOP:
-                        top["children"].append(child)
-                        top["sizes"].append(child_size)
-                        top["total_x"] += child_size[0]
-                        top["total_y"] += child_size[1]
-
-                    elif param.anchor == BOTTOM:
-                        bottom["children"].append(child)
-                        bottom["sizes"].append(child_size)
-                        bottom["total_x"] += child_size[0]
-                        bottom["total_y"] += child_size[1]
-
-                    elif param.anchor == LEFT:
-                        left["children"].append(child)
-                        left["sizes"].append(child_size)
-                        left["total_x"] += child_size[0]
-                        left["total_y"] += child_size[1]
-
-                    elif param.anchor == RIGHT:
-                        right["children"].append(child)
-                        right["sizes"].append(child_size)
-                        right["total_x"] += child_size[0]
-                        right["total_y"] += child_size[1]
-
-                top["total_y"] += self._layout_params.padding * len(top["children"]) - 1
-                bottom["total_y"] += self._layout_params.padding * len(bottom["children"]) - 1
+        hovered = []
+        widget = target
+        while isinstance(widget, Frame):
+            hovered.append(widget)
+            widget = widget.get_parent()
 
-                left["total_x"] += self._layout_params.padding * len(left["children"]) - 1
-                right["total_x"] += self._layout_params.padding * len(right["children"]) - 1
+        entered = set(hovered)
+        for widget in self._hovered:
+            if widget not in entered and widget.is_bound(LEAVE) and self._is_attached(widget):
+                widget.handle_event(MouseEvent(LEAVE, widget, target, pos))
 
-                min_x = max([top["total_x"], bottom["total_x"], left["total_x"] + right["total_x"]])
-                min_y = max([left["total_y"], right["total_y"], top["total_y"] + bottom["total_y"]])
+        left = set(self._hovered)
+        for widget in reversed(hovered):
+            if widget not in left and widget.is_bound(ENTER):
+                widget.handle_event(MouseEvent(ENTER, widget, target, pos))
 
-                # add margin
-                min_x += self.layout_params.margin * 2
-                min_y += self.layout_params.margin * 2
+        self._hovered = tuple(hovered)
 
-                self._min_size = min_x, min_y
+    def _dispatch(self, event_type: str, target: Frame | None, pos: tuple[int, int], **kwargs) -> None:
+        """
+        send an event to the target or (if it has no callbacks for it) its
+        nearest ancestor that has
+        """
+        widget = target
+        while isinstance(widget, Frame):
+            if widget.is_bound(event_type):
+                widget.handle_event(MouseEvent(event_type, widget, target, pos, **kwargs))
+                return
 
-                total_x, total_y = self.calculate_size()
+            widget = widget.get_parent()
 
-                # tell the children where they should be
-                y_cen = total_y / 2
-                x_cen = total_x / 2
+    def _is_attached(self, widget: Frame) -> bool:
+        """
+        check if a widget is (still) part of this window
+        """
+        while isinstance(widget, Frame):
+            widget = widget.get_parent()
 
-                # left
-                x_now = self._layout_params.margin
-                for child, size in zip(left["children"], left["sizes"]):
-                    child.set_position(x_now, y_cen - size[1] / 2)
-                    x_now += size[0] + self._layout_params.padding
+        return widget is self
 
-                    # right
-                x_now = total_x - self._layout_params.margin
-                for child, size in zip(right["children"], right["sizes"]):
-                    child.set_position(x_now - size[0], y_cen - size[1] / 2)
-                    x_now -= size[0] + self._layout_params.padding
+    def _collect_damage(self) -> list[pg.Rect]:
+        """
+        get the (merged) parts of the screen that have to be redrawn
+        """
+        rects = self._damage_rects
+        rects.extend([widget.get_abs_rect() for widget in self._damaged_widgets])
 
-                    # top
-                y_now = self._layout_params.margin
-                for child, size in zip(top["children"], top["sizes"]):
-                    child.set_position(x_cen - size[0] / 2, y_now)
-                    y_now += size[1] + self._layout_params.padding
+        # top-level children leave a hole where they were before
+        if self._children_moved:
+            for child in self._children:
+                rect = child.get_abs_rect()
+                old_rect = self._child_rects.get(child)
 
-                    # bottom
-                y_now = total_y - self._layout_params.margin
-                for child, size in zip(bottom["children"], bottom["sizes"]):
-                    child.set_position(x_cen - size[0] / 2, y_now - size[1])
-                    y_now -= size[1] + self._layout_params.padding
+                if old_rect != rect:
+                    rects.append(rect)
 
-            case 2:
-                rows: list[dict[str, tp.Any | float]] = []
-                columns: list[dict[str, tp.Any | float]] = []
+                    if old_rect is not None:
+                        rects.append(old_rect)
 
-                for child, params in self._child_params:
-                    row, column = params["row"], params["column"]
+                    self._child_rects[child] = rect
 
-                    # if row was not yet made, make all previous ones
-                    if len(rows) <= row:
-                        for n_row in range(len(rows), row + 1):
-                            out = {
-                                "weight": 0,
-                                "children": []
-                            }
+        screen_rect = self.__background.get_rect()
+        damage = merge_rects([rect.clip(screen_rect) for rect in rects])
 
-                            if n_row in self._grid_params.rows:
-                                config = self._grid_params.rows[n_row]
+        self._damage_rects = []
+        self._damaged_widgets.clear()
+        self._children_moved = False
 
-                                if "weight" in config:
-                                    out["weight"] = config["weight"]
+        return damage
 
-                            rows.append(out)
+    def _draw(self) -> list[pg.Rect] | None:
+        """
+        draw everything that changed
 
-                    if len(columns) <= column:
-                        for n_col in range(len(columns), column + 1):
-                            out = {
-                                "weight": 0,
-                                "children": []
-                            }
+        :return: the parts of the screen that have to be updated (None for all of it)
+        """
+        damage = self._collect_damage()
 
-                            if n_col in self._grid_params.columns:
-                                config = self._grid_params.columns[n_col]
+        # fall back to redrawing the whole window if too much has changed
+        if not self._full_redraw and self._damage_tracking:
+            width, height = self.__background.get_size()
+            damaged_area = sum([rect.width * rect.height for rect in damage])
 
-                                if "weight" in config:
-                                    out["weight"] = config["weight"]
+            self._full_redraw = damaged_area > width * height * self._damage_threshold
 
-                            columns.append(out)
-
-                    rows[row]["children"].append((child, params))
-                    columns[column]["children"].append((child, params))
+        if self._full_redraw or not self._damage_tracking:
+            self.__background.fill(self._bg)
 
-                matrix: list[list] = []
+            for child in self._children:
+                child.draw(self.__background)
 
-                for r in range(len(rows)):
-                    matrix.append([])
+            self._full_redraw = False
+            return None
 
-                    for c in range(len(columns)):
-                        # child = set(rows[r]["children"]) & set(columns[c]["children"])
-                        child = [chi for chi in rows[r]["children"] if chi in columns[c]["children"]]
-                        child = list(child)
+        # only redraw the damaged parts
+        for rect in damage:
+            self.__background.set_clip(rect)
+            self.__background.fill(self._bg, rect)
 
-                        if len(child) > 1:
-                            raise ValueError(f"{len(child)} children assigned to row {r} column {c}!")
+            for child in self._children:
+                if rect.colliderect(self._child_rects.get(child, rect)):
+                    child.draw(self.__background)
 
-                        if child:
-                            matrix[r].append(child[0])
+        self.__background.set_clip(None)
+        return damage
 
-                        else:
-                            matrix[r].append(...)
+    def update_screen(self) -> None:
+        """
+        update the screen (deferred while a batch is open)
+        """
+        if self._batch_depth > 0:
+            return
 
-                # calculate the minimal size for each row
-                for r, row in enumerate(rows):
-                    rows[r]["max_size"] = 0
+        # the real layout waits until the window stopped changing its size
+        if self._resize_size is not None:
+            self._show_preview()
+            return
 
-                    for child, params in row["children"]:
-                        _, y = child.calculate_size()
+        layout_count = GeometryManager.layout_count
+        render_count = Frame.render_count
+        start = time.perf_counter()
 
-                        y += 2 * params.margin
+        self.calculate_geometry()
+        layout_done = time.perf_counter()
 
-                        if y > rows[r]["max_size"]:
-                            rows[r]["max_size"] = y
+        damage = self._draw()
+        draw_done = time.perf_counter()
 
-                # calculate the minimal size for each column
-                for c, column in enumerate(columns):
-                    columns[c]["max_size"] = 0
+        if self._headless:
+            pass
 
-                    for child, params in column["children"]:
-                        x, _ = child.calculate_size()
+        elif damage is None:
+            pg.display.flip()
 
-                        x += 2 * params.margin
+        elif damage:
+            pg.display.update(damage)
 
-                        if x > columns[c]["max_size"]:
-                            columns[c]["max_size"] = x
+        # keep the first frame (at a new size) for previewing the next resize
+        if self._capture_preview:
+            self._capture_preview = False
+            self._preview = self.__background.copy() if self._resize_preview else None
 
-                    # calculate the container size
-                width, height = self.calculate_size()
+        present_done = time.perf_counter()
 
-                # only subtract rows that don't have a weight
-                min_width = sum([c["max_size"] for c in columns])
-                min_height = sum([r["max_size"] for r in rows])
+        # statistics
+        self._stats.record(
+            {
+                "events": self._events_time,
+                "layout": (layout_done - start) * 1000,
+                "draw": (draw_done - layout_done) * 1000,
+                "present": (present_done - draw_done) * 1000,
+                "frame": self._events_time + (present_done - start) * 1000,
+            },
+            laid_out=GeometryManager.layout_count - layout_count,
+            drawn=Frame.render_count - render_count,
+        )
+        self._events_time = 0
 
-                # set the windows minimal size
-                self._min_size = min_width, min_height
+        if self._frame_callback is not None:
+            self._frame_callback(self._stats)
 
-                # assign extra space
-                extra_width = width - sum([c["max_size"] for c in columns if c["weight"] == 0])
-                extra_height = height - sum([r["max_size"] for r in rows if r["weight"] == 0])
+    def update(self) -> None:
+        """
+        update posted changes, events and timers
+        """
+        start = time.perf_counter()
 
-                total_row_weight = sum([row["weight"] for row in rows])
-                total_column_weight = sum([column["weight"] for column in columns])
+        self._run_posted()
+        self._event_handler()
+        self._run_timers()
 
-                # print(f"\n\nwindow_size=[{width}, {height}]\tmin_size={[min_width, min_height]}")
-                # print(f"{total_row_weight=}")
-                # print(f"{total_column_weight=}")
-                # print(f"{extra_height=}")
-                # print(f"{extra_width=}")
+        self._events_time += (time.perf_counter() - start) * 1000
 
-                # assign each row and column a specific size
-                for r in range(len(rows)):
-                    if total_row_weight == 0:
-                        rows[r]["height"] = 0
-                    else:
-                        # assign either the minimum size or the calculated dynamic one
-                        w_size = ((rows[r]["weight"] / total_row_weight) * extra_height).__floor__()
-                        rows[r]["height"] = max([w_size, rows[r]["max_size"]])
-                        # print(f"{w_size=}\t{rows[r]['max_size']=}")
+    def _wait_for_next_frame(self) -> None:
+        """
+        keep the frame cap and, in idle mode, sleep until something happens
+        """
+        # (also with vsync, drivers may silently ignore it)
+        if self._fps > 0:
+            self._clock.tick(self._fps)
 
-                    # rows[r]["height"] += rows[r]["max_size"]
-                    rows[r]["y_start"] = sum([prev_row["height"] for prev_row in rows[:r]])
+        if not self._idle or not self._running or self.needs_update:
+            return
 
-                    for c in range(len(columns)):
-                        if total_column_weight == 0:
-                            columns[c]["width"] = 0
-                        else:
-                            # assign either the minimum size or the calculated dynamic one
-                            w_size = ((columns[c]["weight"] / total_column_weight) * extra_width).__floor__()
-                            columns[c]["width"] = max([w_size, columns[c]["max_size"]])
-                            # print(f"{w_size=}\t{columns[c]['max_size']=}")
+        # sleep until an event arrives or the next timer is due
+        if self._timers:
+            timeout = self._timers[0][0] - pg.time.get_ticks()
 
-                        # columns[c]["width"] += columns[c]["max_size"]
-                        columns[c]["x_start"] = sum([prev_col["width"] for prev_col in columns[:c]])
+            if timeout <= 0:
+                return
 
-                        # pg.draw.rect(
-                        #     self.__background,
-                        #     (255, 0, 0, 255),
-                        #     pg.Rect(columns[c]["x_start"], rows[r]["y_start"], columns[c]["width"], rows[r]["height"]),
-                        #     width=1
-                        # )
+            event = pg.event.wait(timeout)
 
-                # place children
-                for child, params in self._child_params:
-                    # place the child proportional to the table and stickiness
-                    # size = list(child.calculate_size())
-                    size = [child._width, child._height]
+        else:
+            event = pg.event.wait()
 
-                    row, column = params["row"], params["column"]
-                    sticky = params["sticky"]
+        if event.type != pg.NOEVENT:
+            self._event_handler([event])
 
-                    width = columns[column]["width"]
-                    height = rows[row]["height"]
+    def step(self, frames: int = 1) -> None:
+        """
+        manually advance one or more frames (without frame pacing)
+        """
+        for _ in range(frames):
+            self.update()
+            self.update_screen()
 
-                    x = columns[column]["x_start"]
-                    y = rows[row]["y_start"]
+    def screenshot(self, path: str) -> None:
+        """
+        save the current content of the screen to an image file
+        """
+        pg.image.save(self.__background, path)
 
-                    x_cen = x + width / 2
-                    y_cen = y + height / 2
+    def mainloop(self):
+        """
+        run the windows main loop
+        """
+        while self._running:
+            self.update()
+            self.update_screen()
+            self._wait_for_next_frame()
 
-                    x_diff = width - size[0]
-                    y_diff = height - size[1]
+    async def run(self) -> None:
+        """
+        run the windows main loop as an asyncio task
 
-                    # print(f"calc: {x_diff}, {y_diff}\t{size}\t{width},{height}")
-                    # print(f"{sticky=}")
+        between frames, the loop yields to the other tasks (sleeping to keep the
+        frame cap). Coroutines run on the same thread as the loop, so they can
+        change widgets directly, the changes show up in the next frame.
 
-                    box_x = x_cen - size[0] / 2
-                    box_y = y_cen - size[1] / 2
+        pygame can't wake up an event loop, so in idle mode the window checks
+        for events every `IDLE_POLL_INTERVAL` milliseconds (or when the next
+        timer is due) while nothing changed
+        """
+        next_frame = time.perf_counter()
 
-                    # assign stickiness
-                    if not child._width_configured:
-                        if "w" in sticky:
-                            size[0] += (x_diff / 2) - params.margin
-                            box_x = x + params.margin
+        while self._running:
+            self.update()
+            self.update_screen()
 
-                        if "e" in sticky:
-                            size[0] += (x_diff / 2) - params.margin
+            # always give the other tasks a chance to run, even if uncapped
+            delay = 0
 
-                        child.assigned_width = size[0]
+            if self._fps > 0:
+                next_frame = max(next_frame + 1 / self._fps, time.perf_counter())
+                delay = next_frame - time.perf_counter()
 
-                    if not child._height_configured:
-                        if "n" in sticky:
-                            size[1] += (y_diff / 2) - params.margin
-                            box_y = y + params.margin
-                            # print("north: ", size, box_x, box_y, "\t\t", width, height)
+            if self._idle and self._running and not self.needs_update:
+                idle_delay = IDLE_POLL_INTERVAL
 
-                        if "s" in sticky:
-                            size[1] += (y_diff / 2) - params.margin
-                            # print("south: ", size, box_x, box_y, "\t\t", width, height)
+                if self._timers:
+                    idle_delay = min(idle_delay, max(self._timers[0][0] - pg.time.get_ticks(), 0))
 
-                        child.assigned_height = size[1]
+                delay = max(delay, idle_delay / 1000)
 
-                    child.set_position(box_x, box_y)
+            await asyncio.sleep(delay)
 
-            case _:
-                raise ValueError(f"Invalid geometry type: {self._layout.__class__.__name__}")
+    def stop(self) -> None:
+        """
+        stop the main loop (`mainloop` or `run`) after the current frame
+        """
+        self._running = False
+
+    def _layout_area(self) -> tuple[float, float]:
+        """
+        the children can use the whole window
+        """
+        return self.calculate_size()
 
     def calculate_size(self) -> tuple[int, int]:
         """
         calculate how big the container should be
         """
-        # make sure the geometry is up-to-date
+        # (a scaled window can have any size, its content keeps the one it was opened with)
+        if self._headless or self._vsync:
+            return self.__background.get_size()
+
         return pg.display.get_window_size()
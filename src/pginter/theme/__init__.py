@@ -1 +1,2 @@
+from ._style import Style, compile_style
 from ._manager import ThemeManager
@@ -7,15 +7,23 @@ The built-in theme manager
 Author:
 Nilusink
 """
+from ._style import Style, compile_style
 from enum import Enum
 from ..types import *
 import typing as tp
+import warnings
+import hashlib
+import weakref
+import types
 import json
 import os
 
 
 DEFAULT_THEME: str = os.path.dirname(__file__) + "/themes/default.json"
 
+# what a broken or half-written theme file can raise while being loaded
+LOAD_ERRORS: tuple[type[Exception], ...] = (OSError, ValueError, TypeError, KeyError, IndexError, AttributeError)
+
 
 class Appearance(Enum):
     dark = 0
@@ -26,6 +34,74 @@ class NotifyEvent(Enum):
     theme_reload = 0
 
 
+class _InstanceRef(weakref.ref):
+    """
+    weak reference to the instance of a subscribed method
+    """
+    __slots__ = ("number",)
+    number: int
+
+
+class Subscription:
+    """
+    one registered notification target
+
+    bound methods are only referenced weakly, so subscribing doesn't keep
+    a widget alive
+    """
+    __slots__ = ("number", "event", "keys", "_ref", "_target")
+
+    def __init__(
+            self,
+            number: int,
+            event: NotifyEvent,
+            who: tp.Callable,
+            keys: tuple[str, ...] | None,
+            on_collected: tp.Callable[[_InstanceRef], None],
+    ) -> None:
+        self.number = number
+        self.event = event
+        self.keys = keys
+
+        # (a plain reference to the instance is a lot smaller than a WeakMethod)
+        if isinstance(who, types.MethodType):
+            self._ref = _InstanceRef(who.__self__, on_collected)
+            self._ref.number = number
+            self._target = who.__func__
+
+        else:
+            self._ref = None
+            self._target = who
+
+    @property
+    def target(self) -> tp.Callable | None:
+        """
+        the callable to notify (None if it has been collected)
+        """
+        if self._ref is None:
+            return self._target
+
+        instance = self._ref()
+        return None if instance is None else types.MethodType(self._target, instance)
+
+    def is_for(self, who: tp.Callable) -> bool:
+        """
+        check if `who` is the subscribed callable
+        """
+        if self._ref is None:
+            return self._target == who
+
+        return isinstance(who, types.MethodType) \
+            and who.__func__ is self._target and who.__self__ is self._ref()
+
+
+def _same_value(a: tp.Any, b: tp.Any) -> bool:
+    """
+    compare two theme values
+    """
+    return type(a) is type(b) and a == b
+
+
 class ThemeManager:
     """
     the build-in theme manager
@@ -33,9 +109,19 @@ class ThemeManager:
     Appearance = Appearance
     NotifyEvent = NotifyEvent
     _appearance: Appearance = Appearance.dark
-    _notify_on: dict[NotifyEvent, list[tp.Callable]] = ...
+    _subscriptions: dict[int, Subscription] = ...
+    _notify_on: dict[NotifyEvent, dict[int, None]] = ...  # (ordered) subscription numbers
+    # subscribers that only depend on some keys, grouped by those keys (widgets of
+    # the same kind share one group)
+    _notify_keys: dict[tuple[str, ...], dict[int, None]] = ...
+    _last_subscription: int = 0
     _config: dict[str, str | dict] = ...
+    _styles: dict[str, str | Style] = ...
+    _values: dict[str, tp.Any] = ...
+    _variants: dict[Appearance, tuple[dict[str, str | Style], dict[str, tp.Any]]] = ...
     _theme_path: str = ...
+    _file_mtime: int = 0
+    _file_digest: str = ""
     instance = ...
 
     def __new__(cls, *args, **kwargs):
@@ -43,64 +129,291 @@ class ThemeManager:
         only on instance of a theme manager should ever exist
         """
         if cls.instance is ...:
-            cls.instance = super().__new__(cls, *args, **kwargs)
+            cls.instance = super().__new__(cls)
 
         return cls.instance
 
     def __init__(self, theme_path: str = ...) -> None:
+        # the instance is shared, so only (re-)load if a theme file is given
+        if self._subscriptions is not ...:
+            if theme_path is not ...:
+                self._theme_path = theme_path
+                self.reload_theme()
+
+            return
+
         # load the theme
         self._theme_path = theme_path
+        self._subscriptions = {}
         self._notify_on = {
-            NotifyEvent.theme_reload: []
+            NotifyEvent.theme_reload: {}
         }
+        self._notify_keys = {}
+        self._styles = {}
+        self._values = {}
 
         self.reload_theme()
 
-    def notify_on(self, event: NotifyEvent, who: tp.Callable) -> None:
+    def notify_on(self, event: NotifyEvent, who: tp.Callable, keys: tp.Iterable[str] = ...) -> int:
         """
         notify the given class on events
 
+        `who` is called with the event and the keys (ex. "frame.bg1") that
+        changed, once per reload. Bound methods are referenced weakly and
+        unsubscribed automatically once their instance is collected.
+
         :param event: the event to notify on
         :param who: the class to notify
+        :param keys: only notify on theme reloads if one of these values changed,
+            defaults to any change
+        :return: the subscription number (for `notify_off`)
         """
-        self._notify_on[event].append(who)
+        self._last_subscription += 1
+        number = self._last_subscription
+
+        keys = None if keys is ... or event is not NotifyEvent.theme_reload else tuple(keys)
+        self._subscriptions[number] = Subscription(number, event, who, keys, self._collected)
+
+        if keys is None:
+            self._notify_on[event][number] = None
+
+        else:
+            self._notify_keys.setdefault(keys, {})[number] = None
+
+        return number
+
+    def notify_off(self, who: tp.Callable | int) -> None:
+        """
+        stop notifying
+
+        :param who: either a subscription number or the subscribed callable
+            (removes all of its subscriptions, slower)
+        """
+        if isinstance(who, int):
+            self._forget(who)
+            return
+
+        for number in [number for number, subscription in self._subscriptions.items() if subscription.is_for(who)]:
+            self._forget(number)
+
+    def _collected(self, ref: _InstanceRef) -> None:
+        """
+        called once the instance of a subscribed method has been garbage collected
+        """
+        self._forget(ref.number)
+
+    def _forget(self, number: int) -> None:
+        """
+        remove a subscription
+        """
+        subscription = self._subscriptions.pop(number, None)
+
+        if subscription is None:
+            return
+
+        if subscription.keys is None:
+            self._notify_on[subscription.event].pop(number, None)
+
+        else:
+            subscribers = self._notify_keys[subscription.keys]
+            subscribers.pop(number, None)
+
+            if not subscribers:
+                del self._notify_keys[subscription.keys]
+
+    def _notify(self, changed: set[str]) -> None:
+        """
+        notify everyone that depends on one of the changed values, once each
+        and in the order they subscribed
+        """
+        if not changed:
+            return
+
+        targets: dict[int, frozenset[str]] = {}
+        for keys, subscribers in tuple(self._notify_keys.items()):
+            relevant = changed.intersection(keys)
+
+            if relevant:
+                relevant = frozenset(relevant)
+
+                for number in tuple(subscribers):
+                    targets[number] = relevant
+
+        everything = frozenset(changed)
+        for number in tuple(self._notify_on[NotifyEvent.theme_reload]):
+            targets[number] = everything
+
+        for number in sorted(targets):
+            subscription = self._subscriptions.get(number)
+            who = None if subscription is None else subscription.target
+
+            if who is not None:
+                who(NotifyEvent.theme_reload, targets[number])
+
+    def _convert_color(self, color: tp.Any, appearance: Appearance) -> tp.Any:
+        """
+        convert a theme value to a color class instance (if it is a color)
+        """
+        if isinstance(color, str):
+            # differentiate between hex and rgb values
+            if color.startswith("#"):
+                return Color.from_hex(color, 255)
+
+            elif color.startswith("rgb"):
+                return Color.from_rgb(*[int(val) for val in color.lstrip("rgb").split(",")])
+
+            else:
+                raise ValueError(f"Invalid color value in theme file: \"{color}\"")
+
+        # rgb values written as tuple
+        elif isinstance(color, list):
+            if isinstance(color[0], float) or isinstance(color[0], int):
+                return Color.from_rgb(*color)
+
+            elif isinstance(color[0], list) or isinstance(color[0], str):
+                return self._convert_color(color[appearance.value], appearance)
+
+        return color
+
+    def _compile(
+            self,
+            config: dict[str, str | dict],
+            appearance: Appearance
+    ) -> tuple[dict[str, str | Style], dict[str, tp.Any]]:
+        """
+        resolve a config for one appearance
+
+        :return: the compiled sections and all values by their key ("section.key")
+        """
+        styles: dict[str, str | Style] = {}
+        values: dict[str, tp.Any] = {}
+
+        for key, val in config.items():
+            if isinstance(val, dict):
+                resolved = {ckey: self._convert_color(color, appearance) for ckey, color in val.items()}
+                styles[key] = compile_style(key, resolved)
+
+                for ckey, value in resolved.items():
+                    values[f"{key}.{ckey}"] = value
+
+            elif isinstance(val, str):
+                styles[key] = values[key] = val
+
+            else:
+                raise ValueError(f"Invalid type for key \"{key}\": {type(val)}")
+
+        return styles, values
+
+    def _activate(self, styles: dict[str, str | Style], values: dict[str, tp.Any]) -> None:
+        """
+        switch to the given (compiled) theme and notify everyone whose values changed
+        """
+        changed = {
+            key for key in self._values.keys() | values.keys()
+            if key not in self._values or key not in values or not _same_value(self._values[key], values[key])
+        }
+
+        self._styles = styles
+        self._values = values
+
+        self._notify(changed)
+
+    def _parse(
+            self,
+            content: bytes
+    ) -> tuple[dict[str, str | dict], dict[Appearance, tuple[dict[str, str | Style], dict[str, tp.Any]]]]:
+        """
+        parse and compile a theme file (without changing the current theme)
+
+        :return: the config and its compiled variants
+        """
+        config = json.loads(content)
+
+        # resolve every appearance once, so switching doesn't have to touch the file
+        variants = {appearance: self._compile(config, appearance) for appearance in Appearance}
+
+        return config, variants
+
+    def _check_complete(self, variants: dict[Appearance, tuple[dict[str, str | Style], dict[str, tp.Any]]]) -> None:
+        """
+        make sure a reloaded theme still has every value of the current one
+        (widgets rely on them)
+        """
+        for _styles, values in variants.values():
+            missing = self._values.keys() - values.keys()
+
+            if missing:
+                raise KeyError(f"the theme is missing {', '.join(sorted(missing))}")
+
+    def _use(
+            self,
+            config: dict[str, str | dict],
+            variants: dict[Appearance, tuple[dict[str, str | Style], dict[str, tp.Any]]]
+    ) -> None:
+        """
+        activate a parsed theme
+        """
+        self._config = config
+        self._variants = variants
+        self._activate(*variants[self._appearance])
 
     def reload_theme(self) -> None:
         """
         reload the config theme
         """
-        self._config = json.load(open(DEFAULT_THEME if self.theme_path is ... else self.theme_path, "r"))
+        path = self.file_path
+        self._file_mtime = os.stat(path).st_mtime_ns
+
+        with open(path, "rb") as inp:
+            content = inp.read()
+
+        self._use(*self._parse(content))
+        self._file_digest = hashlib.sha256(content).hexdigest()
+
+    def check_for_changes(self) -> bool:
+        """
+        reload the theme if its file changed since it was last loaded
+
+        only the widgets depending on values that actually changed get
+        notified. If the new file can't be loaded (ex. while it is still being
+        written), the current theme is kept.
+
+        :return: true if the theme was reloaded
+        """
+        path = self.file_path
 
-        # convert each color to a color class instance
-        def convert_color(color):
-            if isinstance(color, str):
-                # differentiate between hex and rgb values
-                if color.startswith("#"):
-                    return Color.from_hex(color, 255)
+        try:
+            mtime = os.stat(path).st_mtime_ns
 
-                elif color.startswith("rgb"):
-                    return Color.from_rgb(*[int(val) for val in color.lstrip("rgb").split(",")])
+        # editors sometimes replace the file instead of writing it
+        except OSError:
+            return False
 
-                else:
-                    raise ValueError(f"Invalid color value in theme file: \"{color}\"")
+        if mtime == self._file_mtime:
+            return False
 
-            # rgb values written as tuple
-            elif isinstance(color, list):
-                if isinstance(color[0], float) or isinstance(color[0], int):
-                    return Color.from_rgb(*color)
+        self._file_mtime = mtime
 
-                elif isinstance(color[0], list) or isinstance(color[0], str):
-                    return convert_color(color[self._appearance.value])
+        try:
+            with open(path, "rb") as inp:
+                content = inp.read()
 
-            return color
+            # the file was touched but not changed
+            digest = hashlib.sha256(content).hexdigest()
+            if digest == self._file_digest:
+                return False
 
-        for key in self._config.copy():
-            for ckey, color in self._config[key].items():
-                self._config[key][ckey] = convert_color(color)
+            config, variants = self._parse(content)
+            self._check_complete(variants)
 
-        # notify
-        for element in self._notify_on[NotifyEvent.theme_reload]:
-            element(NotifyEvent.theme_reload)
+        # the current theme is kept as it is
+        except LOAD_ERRORS as error:
+            warnings.warn(f"couldn't reload theme \"{path}\": {error!r}")
+            return False
+
+        self._use(config, variants)
+        self._file_digest = digest
+        return True
 
     def set_appearance(self, appearance: Appearance) -> None:
         """
@@ -114,27 +427,32 @@ class ThemeManager:
         else:
             raise ValueError(f"Expected \"Appearance\", got \"{appearance.__class__.__name__}\"")
 
-        self.reload_theme()
+        self._activate(*self._variants[appearance])
+
+    @property
+    def appearance(self) -> Appearance:
+        return self._appearance
 
     @property
     def theme_path(self) -> str:
         return self._theme_path
 
-    def __getattr__(self, item: str) -> str | BetterDict:
+    @property
+    def file_path(self) -> str:
+        """
+        the theme file that is actually used
+        """
+        return DEFAULT_THEME if self._theme_path is ... else self._theme_path
+
+    def __getattr__(self, item: str) -> str | Style:
         """
         for better accessibility
         """
-        val = self._config[item]
-
-        if isinstance(val, dict):
-            return BetterDict(val)
-
-        elif isinstance(val, str):
-            return val
-
-        else:
-            raise ValueError(f"Invalid type for key \"{item}\": {type(val)}")
+        try:
+            return self._styles[item]
 
-    def __getitem__(self, item: str) -> str | BetterDict:
-        return self.__getattr__(item)
+        except KeyError:
+            raise AttributeError(f"the theme has no section \"{item}\"") from None
 
+    def __getitem__(self, item: str) -> str | Style:
+        return self._styles[item]
@@ -0,0 +1,80 @@
+"""
+_style.py
+18. October 2026
+
+compiled, immutable theme sections
+
+Author:
+Nilusink
+"""
+import typing as tp
+
+
+class Style:
+    """
+    an immutable section of a theme (ex. theme.frame)
+
+    each section gets its own slotted subclass, so reading a value is a
+    plain attribute access
+    """
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+
+    def get(self, key: str, default: tp.Any = None) -> tp.Any:
+        """
+        get a value or `default` if the section doesn't define it
+        """
+        return getattr(self, key) if key in self._fields else default
+
+    def as_dict(self) -> dict[str, tp.Any]:
+        return {key: getattr(self, key) for key in self._fields}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._fields
+
+    def __getitem__(self, key: str) -> tp.Any:
+        if key not in self._fields:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __iter__(self) -> tp.Iterator[str]:
+        return iter(self._fields)
+
+    def __setattr__(self, key: str, value: tp.Any) -> None:
+        raise AttributeError(f"theme styles are immutable (tried to set \"{key}\")")
+
+    def __eq__(self, other: tp.Any) -> bool:
+        return isinstance(other, Style) and self.as_dict() == other.as_dict()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.as_dict()}>"
+
+
+# one class per section name and set of keys, so reloading doesn't create new types
+_style_classes: dict[tuple[str, tuple[str, ...]], type[Style]] = {}
+
+
+def compile_style(name: str, values: dict[str, tp.Any]) -> Style:
+    """
+    convert a (parsed) theme section to a style object, nested sections
+    are compiled too
+
+    :param name: the sections name
+    :param values: the sections values
+    """
+    fields = tuple(values)
+    cls = _style_classes.get((name, fields))
+
+    if cls is None:
+        cls = type(f"{name.title().replace('_', '')}Style", (Style,), {"__slots__": fields, "_fields": fields})
+        _style_classes[name, fields] = cls
+
+    style = cls()
+    for key, value in values.items():
+        if isinstance(value, dict):
+            value = compile_style(f"{name}_{key}", value)
+
+        object.__setattr__(style, key, value)
+
+    return style
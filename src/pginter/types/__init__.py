@@ -1,4 +1,7 @@
 from ._geo_types import Absolute, Pack, Grid
+from ._frame_stats import FrameStats
+from ._mouse_event import MouseEvent
 from ._better_dict import BetterDict
+from ._record import Record
 from ._constants import *
 from ._color import Color
@@ -12,8 +12,10 @@ Nilusink
 class BetterDict(dict):
     def __getattr__(self, item):
         result = self[item]
-        if issubclass(type(result), dict):
-            return BetterDict(result)
+
+        # wrap nested dicts only once (in place), not on every access
+        if type(result) is dict:
+            result = self[item] = BetterDict(result)
 
         return result
 
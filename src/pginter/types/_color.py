@@ -10,29 +10,77 @@ Nilusink
 import typing as tp
 
 
+# how many distinct colors are kept for re-use
+INTERN_LIMIT: int = 4096
+
+
 class Color:
-    _rgb: tuple[float, float, float] = ...
-    _alpha: float = 255
-    _hex: str = ...
+    """
+    an immutable rgba color
+
+    every form (rgba, rgb, hex and the packed integer) is calculated once on
+    creation and identical colors share one instance, so colors are cheap to
+    compare and can be used as dictionary keys
+    """
+    __slots__ = ("_rgba", "_rgb", "_hex", "_packed", "_hash")
+    _rgba: tuple[float, float, float, float]
+    _rgb: tuple[float, float, float]
+    _hex: str
+    _packed: int
+    _hash: int
+
+    _interned: dict[tuple[float, float, float, float], "Color"] = {}
+
+    def __new__(cls, red: float = 0, green: float = 0, blue: float = 0, alpha: float = 0) -> "Color":
+        rgba = (red, green, blue, alpha)
+
+        interned = cls._interned.get(rgba)
+        if interned is not None:
+            return interned
+
+        for value in rgba:
+            if not 0 <= value <= 255:
+                raise ValueError(f"color values must be between 0 and 255 (not {value})")
+
+        new = super().__new__(cls)
+        r, g, b, a = (int(value) for value in rgba)
+
+        setattr_ = object.__setattr__
+        setattr_(new, "_rgba", rgba)
+        setattr_(new, "_rgb", rgba[:3])
+        setattr_(new, "_hex", f"#{r:02X}{g:02X}{b:02X}")
+        setattr_(new, "_packed", r << 24 | g << 16 | b << 8 | a)
+        setattr_(new, "_hash", hash(rgba))
+
+        # bounded, the oldest colors are dropped first
+        if len(cls._interned) >= INTERN_LIMIT:
+            del cls._interned[next(iter(cls._interned))]
 
-    def __init__(self) -> None:
-        self.rgb = 0, 0, 0, 0
+        cls._interned[rgba] = new
+
+        return new
 
     # constructors
     @classmethod
     def from_rgb(cls, red: float, green: float, blue: float, alpha: float = ...) -> "Color":
-        new = cls()
-        new.rgb = [red, green, blue] + ([255] if alpha is ... else [alpha])
-
-        return new
+        return cls(red, green, blue, 255 if alpha is ... else alpha)
 
     @classmethod
     def from_hex(cls, hex_value: str, alpha: float = ...) -> "Color":
-        new = cls()
-        new.hex = hex_value
-        new.alpha = 255 if alpha is ... else alpha
+        value = hex_value.removeprefix("#")
 
-        return new
+        if len(value) == 3:  # ex: fff
+            value = 2*value[0] + 2*value[1] + 2*value[2]
+
+        elif len(value) != 6:  # ex: ffffff
+            raise ValueError(f"The hex string must have either 3 or 6 digits! (not \"{hex_value}\")")
+
+        return cls(
+            int(value[0:2], 16),
+            int(value[2:4], 16),
+            int(value[4:6], 16),
+            255 if alpha is ... else alpha
+        )
 
     @classmethod
     def transparent(cls) -> "Color":
@@ -55,6 +103,12 @@ class Color:
         """
         return cls.from_hex("#000")
 
+    def with_alpha(self, alpha: float) -> "Color":
+        """
+        the same color with a different alpha value
+        """
+        return Color(*self._rgb, alpha)
+
     # properties
     @property
     def rgb(self) -> tuple[float, float, float]:
@@ -62,74 +116,42 @@ class Color:
 
     @property
     def rgba(self) -> tuple[float, float, float, float]:
-        return tuple(self._rgb) + (self._alpha,)
-
-    @rgb.setter
-    def rgb(self, value: tuple[float, float, float] | tuple[float, float, float, float]) -> None:
-        if len(value) == 4:
-            *self._rgb, self._alpha = value
-
-        elif len(value) == 3:
-            self._rgb = value
-
-        else:
-            raise ValueError(f"The rgb tuple must have a length of either 3 or 4!  (not {len(value)})")
-
-        self._recalculate_colors("r")
+        return self._rgba
 
     @property
     def hex(self) -> str:
         return self._hex
 
-    @hex.setter
-    def hex(self, value: str) -> None:
-        if len(value) == 3:  # ex: fff
-            self._hex = "#" + 2*value[0] + 2*value[1] + 2*value[2]
-
-        elif len(value) == 4:  # ex: #fff
-            self._hex = "#" + 2*value[1] + 2*value[2] + 2*value[3]
-
-        elif len(value) == 6:  # ex: ffffff
-            self._hex = "#" + value
-
-        elif len(value) == 7:  # ex: #ffffff
-            self._hex = value
-
-        else:
-            raise ValueError(f"The hex string must be either 3, 4 or 6 or 7 characters long! (not {len(value)})")
-
-        self._recalculate_colors("h")
-
     @property
     def alpha(self) -> float:
-        return self.alpha
+        return self._rgba[3]
 
-    @alpha.setter
-    def alpha(self, value: float) -> None:
-        self._alpha = value
+    @property
+    def packed(self) -> int:
+        """
+        the color as one integer (0xRRGGBBAA)
+        """
+        return self._packed
 
-    # internal stuff
-    def _recalculate_colors(self, calc_from: tp.Literal["r", "rgb", "h", "hex"]):
-        if calc_from in ("rgb", "r"):
-            self._hex = f"#" \
-                        f"{hex(self.rgb[0].__floor__())[2:]}" \
-                        f"{hex(self.rgb[1].__floor__())[2:]}" \
-                        f"{hex(self.rgb[2].__floor__())[2:]}".upper()
+    # magic
+    def __setattr__(self, key: str, value: tp.Any) -> None:
+        raise AttributeError(f"colors are immutable (tried to set \"{key}\")")
 
-        elif calc_from in ("hex", "h"):
-            r = self._hex[1:3]
-            g = self._hex[3:5]
-            b = self._hex[5:7]
+    def __eq__(self, other: tp.Any) -> bool:
+        if self is other:
+            return True
 
-            self._rgb = (
-                int(r, 16),
-                int(g, 16),
-                int(b, 16)
-            )
+        if isinstance(other, Color):
+            return self._rgba == other._rgba
 
-            self._hex.upper()
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple[type["Color"], tuple[float, float, float, float]]:
+        return Color, self._rgba
 
-    # magic
     def __hex__(self) -> str:
         return self.hex
 
@@ -21,3 +21,14 @@ W: str = "e"
 NS: str = N + S
 SW: str = S + W
 NSEW: str = N + S + E + W
+
+# mouse events (see `Frame.bind`)
+PRESS: str = "press"
+RELEASE: str = "release"
+CLICK: str = "click"
+MOTION: str = "motion"
+DRAG: str = "drag"
+WHEEL: str = "wheel"
+ENTER: str = "enter"
+LEAVE: str = "leave"
+MOUSE_EVENTS: tuple[str, ...] = (PRESS, RELEASE, CLICK, MOTION, DRAG, WHEEL, ENTER, LEAVE)
@@ -0,0 +1,105 @@
+"""
+_frame_stats.py
+18. October 2026
+
+rolling per-frame timings of the mainloop
+
+Author:
+Nilusink
+"""
+from collections import deque
+import typing as tp
+
+
+PHASES: tuple[str, ...] = ("events", "layout", "draw", "present", "frame")
+
+
+class FrameStats:
+    """
+    timings (in milliseconds) and widget counters of the last frames
+    """
+    frame_count: int = 0
+    _timings: dict[str, deque[float]] = ...
+    _laid_out: deque[int] = ...
+    _drawn: deque[int] = ...
+
+    def __init__(self, window: int = 300) -> None:
+        """
+        :param window: how many frames the percentiles are calculated over
+        """
+        self._timings = {phase: deque(maxlen=window) for phase in PHASES}
+        self._laid_out = deque(maxlen=window)
+        self._drawn = deque(maxlen=window)
+
+    def record(self, timings: dict[str, float], laid_out: int, drawn: int) -> None:
+        """
+        add a frame
+
+        :param timings: milliseconds spent in each phase
+        :param laid_out: how many widgets were laid out this frame
+        :param drawn: how many widgets were rendered this frame
+        """
+        for phase, value in timings.items():
+            self._timings[phase].append(value)
+
+        self._laid_out.append(laid_out)
+        self._drawn.append(drawn)
+        self.frame_count += 1
+
+    @property
+    def last(self) -> dict[str, float]:
+        """
+        the timings of the last frame
+        """
+        return {phase: values[-1] for phase, values in self._timings.items() if values}
+
+    @property
+    def laid_out(self) -> int:
+        """
+        how many widgets were laid out in the last frame
+        """
+        return self._laid_out[-1] if self._laid_out else 0
+
+    @property
+    def drawn(self) -> int:
+        """
+        how many widgets were rendered in the last frame
+        """
+        return self._drawn[-1] if self._drawn else 0
+
+    def percentile(self, phase: str, percent: float) -> float:
+        """
+        get a percentile of a phases timings
+
+        :param phase: one of "events", "layout", "draw", "present" or "frame"
+        :param percent: 0 - 100
+        """
+        values = sorted(self._timings[phase])
+
+        if not values:
+            return 0
+
+        return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+    def summary(self) -> dict[str, tp.Any]:
+        """
+        p50 / p95 / p99 of every phase and the widget counters
+        """
+        out: dict[str, tp.Any] = {"frames": self.frame_count}
+
+        for phase in PHASES:
+            out[phase] = {
+                "p50": self.percentile(phase, 50),
+                "p95": self.percentile(phase, 95),
+                "p99": self.percentile(phase, 99),
+            }
+
+        out["laid_out"] = self.laid_out
+        out["drawn"] = self.drawn
+
+        return out
+
+    def __repr__(self) -> str:
+        frame = self.summary()["frame"]
+        return f"<FrameStats frames={self.frame_count} p50={frame['p50']:.2f}ms " \
+               f"p95={frame['p95']:.2f}ms p99={frame['p99']:.2f}ms>"
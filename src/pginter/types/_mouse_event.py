@@ -0,0 +1,51 @@
+"""
+_mouse_event.py
+18. October 2026
+
+what widgets get passed when the mouse does something
+
+Author:
+Nilusink
+"""
+import typing as tp
+
+
+class MouseEvent:
+    """
+    a mouse event, as passed to the callbacks of `Frame.bind`
+    """
+    __slots__ = ("type", "widget", "target", "pos", "x", "y", "button", "rel", "wheel")
+    type: str  # one of MOUSE_EVENTS
+    widget: tp.Any  # the widget whose callback is called
+    target: tp.Any  # the topmost widget under the cursor (may be a child of `widget`)
+    pos: tuple[int, int]  # position on the screen
+    x: int  # position relative to `widget`
+    y: int
+    button: int  # the pressed / released button (0 if there is none)
+    rel: tuple[int, int]  # relative motion (MOTION and DRAG)
+    wheel: tuple[int, int]  # scrolled amount (WHEEL)
+
+    def __init__(
+            self,
+            type: str,
+            widget: tp.Any,
+            target: tp.Any,
+            pos: tuple[int, int],
+            button: int = 0,
+            rel: tuple[int, int] = (0, 0),
+            wheel: tuple[int, int] = (0, 0),
+    ) -> None:
+        self.type = type
+        self.widget = widget
+        self.target = target
+        self.pos = pos
+        self.button = button
+        self.rel = rel
+        self.wheel = wheel
+
+        x, y = widget.get_abs_position()
+        self.x = pos[0] - x
+        self.y = pos[1] - y
+
+    def __repr__(self) -> str:
+        return f"<MouseEvent {self.type} at {self.pos} on {self.widget.__class__.__name__}>"
@@ -0,0 +1,59 @@
+"""
+_record.py
+18. October 2026
+
+compact, fixed-field replacement for BetterDict configs
+
+Author:
+Nilusink
+"""
+import typing as tp
+
+
+class Record:
+    """
+    a mutable set of fixed fields, accessible like a BetterDict
+    (`record.key` or `record["key"]`)
+
+    subclasses list their fields in `__slots__`, so an instance only stores
+    the values themselves
+    """
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs) -> None:
+        for key, value in zip(self.__slots__, args):
+            setattr(self, key, value)
+
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    def get(self, key: str, default: tp.Any = None) -> tp.Any:
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def update(self, values: dict[str, tp.Any]) -> None:
+        for key, value in values.items():
+            self[key] = value
+
+    def as_dict(self) -> dict[str, tp.Any]:
+        return {key: getattr(self, key) for key in self.__slots__ if hasattr(self, key)}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def __getitem__(self, key: str) -> tp.Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: tp.Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+
+        setattr(self, key, value)
+
+    def __eq__(self, other: tp.Any) -> bool:
+        return type(other) is type(self) and self.as_dict() == other.as_dict()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.as_dict()}>"
@@ -1 +1,3 @@
-from ._funcs import arg_or_default
+from ._funcs import arg_or_default, merge_rects
+from ._profiler import Profiler
+from ._spatial_index import SpatialIndex
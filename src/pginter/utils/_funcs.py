@@ -8,6 +8,7 @@ Author:
 Nilusink
 """
 import typing as tp
+import pygame as pg
 
 
 def arg_or_default(value: tp.Any, default_value: tp.Any, check_if: tp.Any = ...) -> tp.Any:
@@ -17,3 +18,32 @@ def arg_or_default(value: tp.Any, default_value: tp.Any, check_if: tp.Any = ...)
     :param check_if: what to check for
     """
     return default_value if value is check_if else value
+
+
+def merge_rects(rects: tp.Iterable[pg.Rect], limit: int = 64) -> list[pg.Rect]:
+    """
+    merge overlapping rectangles until none of them overlap anymore
+
+    :param rects: the rectangles to merge (empty ones are dropped)
+    :param limit: with more rectangles than this, their bounding box is returned
+        instead (merging is quadratic)
+    """
+    rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
+
+    if len(rects) > limit:
+        return [rects[0].unionall(rects[1:])]
+
+    merged: list[pg.Rect] = []
+
+    for rect in rects:
+        rect = rect.copy()
+
+        # the grown rect may now overlap rects that were merged before
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+
+        merged.append(rect)
+
+    return merged
@@ -0,0 +1,196 @@
+"""
+_profiler.py
+18. October 2026
+
+per-widget layout and render profiler
+
+Author:
+Nilusink
+"""
+from time import perf_counter
+import functools
+import typing as tp
+
+
+PROFILED_METHODS: tuple[str, ...] = (
+    "calculate_geometry",
+    "calculate_size",
+    "measure",
+    "arrange",
+    "draw",
+    "_render",
+)
+
+
+class ProfileNode:
+    """
+    one call site (widget + method) in the call tree
+    """
+    __slots__ = ("name", "calls", "inclusive", "children")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.inclusive = 0.0
+        self.children: dict[str, "ProfileNode"] = {}
+
+    @property
+    def exclusive(self) -> float:
+        """
+        time spent in this node without its children
+        """
+        return self.inclusive - sum([child.inclusive for child in self.children.values()])
+
+    def walk(self, path: tuple[str, ...] = ()) -> tp.Iterator[tuple[tuple[str, ...], "ProfileNode"]]:
+        """
+        iterate over all nodes below this one (depth first) with their stack
+        """
+        for child in self.children.values():
+            child_path = path + (child.name,)
+            yield child_path, child
+            yield from child.walk(child_path)
+
+
+class Profiler:
+    """
+    wraps the layout and draw methods of every widget class while active and
+    builds a call tree with inclusive / exclusive times and call counts
+
+    nothing is wrapped while the profiler isn't running, so it costs nothing
+    when disabled
+
+    usage:
+        with Profiler() as profiler:
+            root.update_screen()
+
+        print(profiler.report())
+    """
+    _root: ProfileNode = ...
+    _stack: list[ProfileNode] = ...
+    _originals: list[tuple[type, str, tp.Callable]] = ...
+
+    def __init__(self) -> None:
+        self._root = ProfileNode("root")
+        self._stack = [self._root]
+        self._originals = []
+
+    @property
+    def running(self) -> bool:
+        return len(self._originals) > 0
+
+    @property
+    def tree(self) -> ProfileNode:
+        """
+        the root of the call tree
+        """
+        return self._root
+
+    def start(self) -> None:
+        """
+        wrap the methods of all widget classes
+        """
+        if self.running:
+            return
+
+        # imported here, the widgets themselves depend on utils
+        from ..widgets import GeometryManager
+
+        classes = [GeometryManager]
+        for cls in classes:
+            classes.extend(cls.__subclasses__())
+
+        for cls in classes:
+            for name in PROFILED_METHODS:
+                if name in cls.__dict__:
+                    func = cls.__dict__[name]
+                    self._originals.append((cls, name, func))
+                    setattr(cls, name, self._wrap(name, func))
+
+    def stop(self) -> None:
+        """
+        restore the original methods
+        """
+        for cls, name, func in reversed(self._originals):
+            setattr(cls, name, func)
+
+        self._originals.clear()
+
+    def reset(self) -> None:
+        """
+        clear all collected data
+        """
+        self._root = ProfileNode("root")
+        self._stack = [self._root]
+
+    def _wrap(self, method: str, func: tp.Callable) -> tp.Callable:
+        """
+        time every call of `func`
+        """
+        stack = self._stack
+
+        @functools.wraps(func)
+        def wrapper(widget, *args, **kwargs):
+            name = f"{type(widget).__name__}@{id(widget):x}.{method}"
+            parent = stack[-1]
+
+            # an override calling `super()`, already timed by the outer call
+            if parent.name == name:
+                return func(widget, *args, **kwargs)
+
+            node = parent.children.get(name)
+            if node is None:
+                node = parent.children[name] = ProfileNode(name)
+
+            stack.append(node)
+            start = perf_counter()
+
+            try:
+                return func(widget, *args, **kwargs)
+
+            finally:
+                node.inclusive += perf_counter() - start
+                node.calls += 1
+                stack.pop()
+
+        return wrapper
+
+    # reports
+    def report(self, limit: int = 50) -> str:
+        """
+        a flat text report, sorted by exclusive time
+
+        :param limit: maximum number of lines (excluding the header)
+        """
+        flat: dict[str, list[float]] = {}
+
+        for _path, node in self._root.walk():
+            entry = flat.setdefault(node.name, [0, 0.0, 0.0])
+            entry[0] += node.calls
+            entry[1] += node.inclusive
+            entry[2] += node.exclusive
+
+        lines = [f"{'calls':>8} {'incl. ms':>10} {'excl. ms':>10}  name"]
+        for name, (calls, inclusive, exclusive) in sorted(flat.items(), key=lambda e: -e[1][2])[:limit]:
+            lines.append(f"{calls:>8} {inclusive * 1000:>10.3f} {exclusive * 1000:>10.3f}  {name}")
+
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """
+        the call tree in the collapsed stack format used by flamegraph tools
+        (exclusive time in microseconds)
+        """
+        lines = []
+
+        for path, node in self._root.walk():
+            lines.append(f"{';'.join(path)} {round(node.exclusive * 1_000_000)}")
+
+        return "\n".join(lines)
+
+    # magic
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
@@ -0,0 +1,168 @@
+"""
+_spatial_index.py
+18. October 2026
+
+find the topmost rectangle at a point without looking at all of them
+
+Author:
+Nilusink
+"""
+import typing as tp
+import math
+
+
+MIN_LEVEL: int = 5  # the smallest cells are 32x32 pixels
+
+
+class SpatialIndex:
+    """
+    a hierarchical grid of rectangles with a z-order
+
+    every rectangle is stored in the grid level whose cells are at least as
+    big as the rectangle, so it covers at most 2x2 cells. A lookup checks one
+    cell per level that is in use, inserting, moving and removing only
+    touch the cells of one rectangle.
+    """
+    __slots__ = ("_items", "_cells", "_levels", "_top", "_bottom")
+
+    def __init__(self) -> None:
+        # item -> (x, y, width, height, z, cells)
+        self._items: dict[tp.Any, tuple[int, int, int, int, int, tuple[tuple[int, int, int], ...]]] = {}
+        self._cells: dict[tuple[int, int, int], list[tp.Any]] = {}
+        self._levels: dict[int, int] = {}  # level -> number of items
+        self._top = 0
+        self._bottom = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: tp.Any) -> bool:
+        return item in self._items
+
+    def insert(self, item: tp.Any, rect: tuple[int, int, int, int]) -> None:
+        """
+        add an item (above all others) or move it if it is already indexed
+
+        :param rect: x, y, width and height
+        """
+        if item in self._items:
+            self.update(item, rect)
+            return
+
+        self._top += 1
+        self._add(item, rect, self._top)
+
+    def update(self, item: tp.Any, rect: tuple[int, int, int, int]) -> None:
+        """
+        move an item, keeping its z-order
+        """
+        old = self._items.get(item)
+
+        if old is None:
+            raise KeyError(item)
+
+        if old[:4] == tuple(rect):
+            return
+
+        self._discard(item, old)
+        self._add(item, rect, old[4])
+
+    def remove(self, item: tp.Any) -> None:
+        old = self._items.pop(item, None)
+
+        if old is not None:
+            self._discard(item, old)
+
+    def raise_item(self, item: tp.Any) -> None:
+        """
+        move an item above all others
+        """
+        self._top += 1
+        self._set_z(item, self._top)
+
+    def lower_item(self, item: tp.Any) -> None:
+        """
+        move an item below all others
+        """
+        self._bottom -= 1
+        self._set_z(item, self._bottom)
+
+    def at(self, x: float, y: float) -> tp.Any | None:
+        """
+        the topmost item containing the point (None if there is none)
+        """
+        found = None
+        found_z = None
+        items = self._items
+        cx, cy = math.floor(x), math.floor(y)
+
+        for level in self._levels:
+            for item in self._cells.get((level, cx >> level, cy >> level), ()):
+                ix, iy, width, height, z, _cells = items[item]
+
+                if ix <= x < ix + width and iy <= y < iy + height and (found_z is None or z > found_z):
+                    found = item
+                    found_z = z
+
+        return found
+
+    def overlapping(self, rect: tuple[int, int, int, int]) -> list[tp.Any]:
+        """
+        all items that overlap the rectangle, from bottom to top
+        """
+        x, y, width, height = rect
+        right, bottom = x + width, y + height
+        items = self._items
+        found = set()
+
+        for level in self._levels:
+            for cx in range(x >> level, ((right - 1) >> level) + 1):
+                for cy in range(y >> level, ((bottom - 1) >> level) + 1):
+                    for item in self._cells.get((level, cx, cy), ()):
+                        ix, iy, i_width, i_height, _z, _cells = items[item]
+
+                        if ix < right and iy < bottom and ix + i_width > x and iy + i_height > y:
+                            found.add(item)
+
+        return sorted(found, key=lambda item: items[item][4])
+
+    # internal stuff
+    def _add(self, item: tp.Any, rect: tuple[int, int, int, int], z: int) -> None:
+        x, y, width, height = rect
+
+        # the smallest level whose cells are at least as big as the rectangle
+        level = max(MIN_LEVEL, (max(width, height, 1) - 1).bit_length())
+        x0, y0 = x >> level, y >> level
+        x1, y1 = (x + max(width, 1) - 1) >> level, (y + max(height, 1) - 1) >> level
+
+        if x0 == x1 and y0 == y1:
+            cells = ((level, x0, y0),)
+
+        else:
+            cells = tuple([(level, cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)])
+
+        for cell in cells:
+            self._cells.setdefault(cell, []).append(item)
+
+        self._levels[level] = self._levels.get(level, 0) + 1
+        self._items[item] = (x, y, width, height, z, cells)
+
+    def _discard(self, item: tp.Any, old: tuple) -> None:
+        cells = old[5]
+
+        for cell in cells:
+            bucket = self._cells[cell]
+            bucket.remove(item)
+
+            if not bucket:
+                del self._cells[cell]
+
+        level = cells[0][0]
+        self._levels[level] -= 1
+
+        if self._levels[level] == 0:
+            del self._levels[level]
+
+    def _set_z(self, item: tp.Any, z: int) -> None:
+        x, y, width, height, _z, cells = self._items[item]
+        self._items[item] = (x, y, width, height, z, cells)
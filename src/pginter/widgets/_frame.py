@@ -7,15 +7,18 @@ Frame - the base widget
 Author:
 Nilusink
 """
-from ._geo_manager import GeometryManager
-from ..theme import ThemeManager
-from ..utils import arg_or_default
+from ._geo_manager import GeometryManager, WIDTH_CONFIGURED, HEIGHT_CONFIGURED
+from ..theme import ThemeManager, Style
 from ..types import *
 import typing as tp
 import pygame as pg
 
 
-class DisplayConfig(tp.TypedDict):
+class DisplayConfig(Record):
+    """
+    how a frame looks
+    """
+    __slots__ = ("bg", "ulr", "urr", "llr", "lrr", "border_width", "border_color")
     bg: Color
     ulr: int  # border radii
     urr: int
@@ -25,14 +28,10 @@ class DisplayConfig(tp.TypedDict):
     border_color: Color
 
 
-class DisplayConfigConfigured(tp.TypedDict):
-    bg: bool
-    ulr: bool
-    urr: bool
-    llr: bool
-    lrr: bool
-    border_width: bool
-    border_color: bool
+# bits of `Frame._configured`, one per display config key
+CONFIGURED_FLAGS: dict[str, int] = {
+    key: 1 << bit for bit, key in enumerate(DisplayConfig.__slots__, start=HEIGHT_CONFIGURED.bit_length())
+}
 
 
 def display_configurify(key: str) -> str:
@@ -41,8 +40,8 @@ def display_configurify(key: str) -> str:
     """
     replaces = [
         ("bg_color", "bg"),
-        ("border_bottom_left_radius", "blr"),
-        ("border_bottom_right_radius", "brr"),
+        ("border_bottom_left_radius", "llr"),
+        ("border_bottom_right_radius", "lrr"),
         ("border_top_left_radius", "ulr"),
         ("border_top_right_radius", "urr"),
     ]
@@ -54,15 +53,63 @@ def display_configurify(key: str) -> str:
     return key
 
 
+THEME_RADIUS_KEYS: tuple[str, ...] = (
+    "frame.border_radius",
+    "frame.border_top_radius",
+    "frame.border_bottom_radius",
+    "frame.border_top_left_radius",
+    "frame.border_top_right_radius",
+    "frame.border_bottom_left_radius",
+    "frame.border_bottom_right_radius",
+)
+
+
+def _theme_radii(style: Style) -> dict[str, int]:
+    """
+    get the border radius of each corner from the theme
+    """
+    radius = style.get("border_radius", 0)
+    top = style.get("border_top_radius", radius)
+    bottom = style.get("border_bottom_radius", radius)
+
+    return {
+        "ulr": style.get("border_top_left_radius", top),
+        "urr": style.get("border_top_right_radius", top),
+        "llr": style.get("border_bottom_left_radius", bottom),
+        "lrr": style.get("border_bottom_right_radius", bottom),
+    }
+
+
+# containers with more children than this only draw the ones that overlap
+# the area being rendered (if it is small)
+INDEXED_DRAW_MIN: int = 64
+
+
+# the theme keys of frames by which values are configured
+_theme_keys_cache: dict[int, tuple[str, ...]] = {}
+
+
 class Frame(GeometryManager):
     """
     The base widget
     """
+    __slots__ = (
+        "__parent", "_display_config", "_theme", "_subscription", "_x", "_y", "_surface", "_rendered_area", "_render_dirty",
+        "_damage_reported", "_bindings", "_placed_rect"
+    )
     __parent: tp.Union["Frame", tp.Any]
-    _display_config: BetterDict = ...
-    _display_config_configured: BetterDict = ...
-    _x: int = -1
-    _y: int = -1
+    _display_config: DisplayConfig
+    _theme: ThemeManager
+    _subscription: int
+    _x: int
+    _y: int
+    _surface: pg.Surface
+    _rendered_area: pg.Rect | None  # the part of the surface that is up-to-date
+    _render_dirty: bool
+    _damage_reported: bool  # the whole area of the frame will be redrawn
+    _bindings: dict[str, list[tp.Callable[[MouseEvent], tp.Any]]] | None
+    _placed_rect: tuple[int, int, int, int] | None  # the area the parent last saw the frame in
+    render_count: int = 0  # how many frames have been rendered (all instances)
 
     def __init__(
             self,
@@ -97,28 +144,34 @@ class Frame(GeometryManager):
         :param border_color: the color of the border
         """
 
+        self.__parent = parent
+        self._theme = parent.theme
+        style = self._theme.frame
+
+        if margin is ...:
+            margin = style.get("margin", 0)
+
+        if padding is ...:
+            padding = style.get("padding", 0)
+
+        super().__init__(layout, margin, padding)
+
+        self._x = -1
+        self._y = -1
+        self._surface = ...
+        self._rendered_area = None
+        self._render_dirty = True
+        self._damage_reported = False
+        self._bindings = None
+        self._placed_rect = None
+
         if min_width is not ...:
             self._width = min_width
 
         if min_height is not ...:
             self._height = min_height
 
-        self.__parent = parent
-
-        self.__parent.theme.notify_on(ThemeManager.NotifyEvent.theme_reload, self.notify)
-
-        # mutable defaults
-        display_config: DisplayConfig = {
-            "bg": ...,
-            "ulr": self.theme.frame.border_top_left_radius if "border_top_left_radius" in self.theme.frame else 0,
-            "urr": self.theme.frame.border_top_right_radius if "border_top_right_radius" in self.theme.frame else 0,
-            "llr": self.theme.frame.border_bottom_left_radius if "border_bottom_left_radius" in self.theme.frame else 0,
-            "lrr": self.theme.frame.border_bottom_right_radius if "border_bottom_right_radius" in self.theme.frame else 0,
-            "border_width": self.theme.frame.border_width if "border_width" in self.theme.frame else 0,
-            "border_color": ...,
-        }
-
-        display_config_configured: DisplayConfigConfigured = {
+        configured = {
             "bg": bg_color is not ...,
             "ulr": border_radius is not ... or border_top_radius is not ... or border_top_left_radius is not ...,
             "urr": border_radius is not ... or border_top_radius is not ... or border_top_right_radius is not ...,
@@ -128,16 +181,9 @@ class Frame(GeometryManager):
             "border_color": border_color is not ...,
         }
 
-        self._display_config = BetterDict(display_config)
-        self._display_config_configured = BetterDict(display_config_configured)
-
-        if margin is ...:
-            margin = self.theme.frame.margin if "margin" in self.theme.frame else 0
-
-        if padding is ...:
-            padding = self.theme.frame.padding if "padding" in self.theme.frame else 0
-
-        super().__init__(layout, margin, padding)
+        for key, is_configured in configured.items():
+            if is_configured:
+                self._configured |= CONFIGURED_FLAGS[key]
 
         # arguments
         if width is not ...:
@@ -146,46 +192,47 @@ class Frame(GeometryManager):
         if height is not ...:
             self.height = height
 
-        self._display_config["bg"] = self.theme.frame.bg1 if bg_color is ... else bg_color
-        if isinstance(self.__parent, Frame) and self.__parent._display_config["bg"] == self.theme.frame.bg1:
-            self._display_config["bg"] = self.theme.frame.bg2 if bg_color is ... else bg_color
-
-        if border_width is not ...:
-            self._display_config["border_width"] = border_width
-
-        self._display_config["border_color"] = self.theme.frame.border if border_color is ... else border_color
-
-        # border radii
-        if border_radius is ... and "border_radius" in self.theme.frame:
-            border_radius = self.theme.frame.border_radius
-
-        if border_bottom_radius is ... and "border_bottom_radius" in self.theme.frame:
-            border_bottom_radius = self.theme.frame.border_bottom_radius
-
-        if border_top_radius is ... and "border_top_radius" in self.theme.frame:
-            border_top_radius = self.theme.frame.border_top_radius
-
-        self._display_config["ulr"] = self._display_config["urr"] = border_radius
-        self._display_config["llr"] = self._display_config["lrr"] = border_radius
-
-        if border_top_radius is not ...:
-            self._display_config["ulr"] = border_top_radius
-            self._display_config["urr"] = border_top_radius
-
-        if border_bottom_radius is not ...:
-            self._display_config["llr"] = border_bottom_radius
-            self._display_config["lrr"] = border_bottom_radius
+        bg = style.bg1 if bg_color is ... else bg_color
+        if isinstance(self.__parent, Frame) and self.__parent._display_config.bg == style.bg1:
+            bg = style.bg2 if bg_color is ... else bg_color
+
+        # border radii (the most specific argument wins, then the theme)
+        radii = _theme_radii(style)
+        corner_args = {
+            "ulr": (border_top_left_radius, border_top_radius),
+            "urr": (border_top_right_radius, border_top_radius),
+            "llr": (border_bottom_left_radius, border_bottom_radius),
+            "lrr": (border_bottom_right_radius, border_bottom_radius),
+        }
 
-        self._display_config.ulr = arg_or_default(border_top_left_radius, self._display_config.ulr, ...)
-        self._display_config.urr = arg_or_default(border_top_right_radius, self._display_config.urr, ...)
+        for corner, (corner_radius, side_radius) in corner_args.items():
+            for value in (corner_radius, side_radius, border_radius):
+                if value is not ...:
+                    radii[corner] = value
+                    break
+
+        self._display_config = DisplayConfig(
+            bg=bg,
+            border_width=style.get("border_width", 0) if border_width is ... else border_width,
+            border_color=style.border if border_color is ... else border_color,
+            **radii
+        )
 
-        self._display_config.llr = arg_or_default(border_bottom_left_radius, self._display_config.llr, ...)
-        self._display_config.lrl = arg_or_default(border_bottom_right_radius, self._display_config.lrr, ...)
+        self._subscription = self._theme.notify_on(
+            ThemeManager.NotifyEvent.theme_reload,
+            self.notify,
+            keys=self._theme_keys()
+        )
 
     def configure(self, **kwargs) -> None:
         """
         configure any of the init parameters (except parent)
+
+        only changes of the size, margin or padding cause a new layout, the
+        rest just redraws the frame
         """
+        relayout = False
+
         for key, value in kwargs.items():
             match key:
                 case "width":
@@ -195,117 +242,291 @@ class Frame(GeometryManager):
                     self.height = value
 
                 case "border_radius":
-                    self._display_config.ulr = value
-                    self._display_config.urr = value
-                    self._display_config.blr = value
-                    self._display_config.brr = value
+                    self._set_display("ulr", value)
+                    self._set_display("urr", value)
+                    self._set_display("llr", value)
+                    self._set_display("lrr", value)
 
                 case "border_bottom_radius":
-                    self._display_config.blr = value
-                    self._display_config.brr = value
+                    self._set_display("llr", value)
+                    self._set_display("lrr", value)
 
                 case "border_top_radius":
-                    self._display_config.ulr = value
-                    self._display_config.urr = value
+                    self._set_display("ulr", value)
+                    self._set_display("urr", value)
 
                 case _:
                     # check if in display config
                     new_key = display_configurify(key)
 
                     if new_key in self._display_config:
-                        if isinstance(value, type(self._display_config[new_key])):
+                        if not isinstance(value, type(self._display_config[new_key])):
                             raise TypeError(
                                 f"Can't change \"{self._display_config[new_key]}\" to \"{value}\": "
                                 f"invalid type!"
                             )
 
-                        self._display_config[key] = value
+                        self._set_display(new_key, value)
 
                     elif key in self.layout_params:
-                        if isinstance(value, type(self.layout_params[new_key])):
+                        if not isinstance(value, type(self.layout_params[key])):
                             raise TypeError(
-                                f"Can't change \"{self.layout_params[new_key]}\" to \"{value}\": "
+                                f"Can't change \"{self.layout_params[key]}\" to \"{value}\": "
                                 f"invalid type!"
                             )
 
                         self.layout_params[key] = value
+                        relayout = True
+
+        # (setting width and height already invalidates the layout)
+        if relayout:
+            self.invalidate_layout()
+
+        self.invalidate_render()
+
+    def _set_display(self, key: str, value: tp.Any) -> None:
+        """
+        set a display config value by the user (the theme won't override it anymore)
+        """
+        self._display_config[key] = value
+        self._configured |= CONFIGURED_FLAGS[key]
+
+    def _is_configured(self, key: str) -> bool:
+        """
+        check if a display config value was set by the user
+        """
+        return bool(self._configured & CONFIGURED_FLAGS[key])
 
     @property
     def theme(self) -> ThemeManager:
-        return self.__parent.theme
+        return self._theme
+
+    def get_parent(self) -> tp.Optional[GeometryManager]:
+        """
+        the container this frame is placed in (None if deleted)
+        """
+        return None if self.__parent is ... else self.__parent
 
     # interfacing
-    def notify(self, event: ThemeManager.NotifyEvent) -> None:
+    def notify(self, event: ThemeManager.NotifyEvent, changed: tp.Collection[str] = ...) -> None:
         """
         gets called by another class
+
+        :param event: what happened
+        :param changed: which theme values changed (defaults to all of them)
         """
         match event:
             case ThemeManager.NotifyEvent.theme_reload:
                 # the theme has been reloaded
-                if not self._display_config_configured.bg:
-                    if isinstance(self.__parent, Frame) and self.__parent._display_config["bg"] == self.theme.frame.bg1:
-                        self._display_config.bg = self.theme.frame.bg2
+                style = self._theme.frame
+                everything = changed is ...
+
+                if not self._is_configured("bg") \
+                        and (everything or "frame.bg1" in changed or "frame.bg2" in changed):
+                    if isinstance(self.__parent, Frame) and self.__parent._display_config.bg == style.bg1:
+                        self._display_config.bg = style.bg2
 
                     else:
-                        self._display_config.bg = self.theme.frame.bg1
+                        self._display_config.bg = style.bg1
+
+                if not self._is_configured("border_color") and (everything or "frame.border" in changed):
+                    self._display_config.border_color = style.border
+
+                if not self._is_configured("border_width") \
+                        and (everything or "frame.border_width" in changed):
+                    self._display_config.border_width = style.get("border_width", 0)
+
+                if everything or not set(THEME_RADIUS_KEYS).isdisjoint(changed):
+                    for corner, radius in _theme_radii(style).items():
+                        if not self._is_configured(corner):
+                            self._display_config[corner] = radius
+
+                # theme values only change how the frame looks, not its size
+                self.invalidate_render()
+
+    def _theme_keys(self) -> tuple[str, ...]:
+        """
+        the theme values this frame depends on
+        """
+        # frames configured the same way share one tuple
+        configured = self._configured & ~(WIDTH_CONFIGURED | HEIGHT_CONFIGURED)
+        if configured in _theme_keys_cache:
+            return _theme_keys_cache[configured]
+
+        keys = []
+
+        if not self._is_configured("bg"):
+            keys.extend(["frame.bg1", "frame.bg2"])
+
+        if not self._is_configured("border_color"):
+            keys.append("frame.border")
+
+        if not self._is_configured("border_width"):
+            keys.append("frame.border_width")
+
+        if not all([self._is_configured(corner) for corner in ("ulr", "urr", "llr", "lrr")]):
+            keys.extend(THEME_RADIUS_KEYS)
+
+        keys = _theme_keys_cache[configured] = tuple(keys)
+        return keys
+
+    def invalidate_render(self) -> None:
+        """
+        mark the cached surface of this frame and all of its ancestors as outdated
+        """
+        # children outside the rendered area of their parent stay dirty while
+        # the parent doesn't, so the walk can't stop at the first dirty frame
+        node = self
+        while isinstance(node, Frame):
+            node._render_dirty = True
+            node = node.get_parent()
+
+        # frames marked by one of their children have only reported the area
+        # of that child, so this is tracked separately
+        if not self._damage_reported:
+            self._damage_reported = True
+            self.report_damage(self)
+
+    def report_area(self, rect: tuple[int, int, int, int]) -> None:
+        """
+        redraw a part of the frame (in its own coordinates), ex. where a child was
+        """
+        # the parents are marked by passing the area on
+        self._render_dirty = True
+
+        parent = self.get_parent()
+
+        if parent is not None:
+            x, y, width, height = rect
+            parent.report_area((x + int(self._x), y + int(self._y), width, height))
 
-                if not self._display_config_configured.border_color:
-                    self._display_config.border_color = self.theme.frame.border
+    def get_abs_position(self) -> tuple[float, float]:
+        """
+        the frames position on the screen
+        """
+        parent = self.get_parent()
+        x, y = (0, 0) if parent is None else parent.get_abs_position()
+
+        return x + self._x, y + self._y
+
+    def get_abs_rect(self) -> pg.Rect:
+        """
+        the area the frame covers on the screen (as drawn, every parent blits
+        its children at whole pixels)
+        """
+        x, y = int(self._x), int(self._y)
+
+        parent = self.get_parent()
+        while isinstance(parent, Frame):
+            x += int(parent._x)
+            y += int(parent._y)
+            parent = parent.get_parent()
+
+        return pg.Rect(x, y, *self.get_size())
 
-                if not self._display_config_configured.border_radius:
-                    self._display_config.border_radius = self.theme.frame.border_radius
+    def get_hit_rect(self) -> tuple[int, int, int, int]:
+        """
+        the area the frame covers in its parent (as drawn)
+        """
+        width, height = self.get_size()
+        return int(self._x), int(self._y), width, height
 
     def get_size(self) -> tuple[int, int]:
         """
         get the frames size (including children)
         """
         # width
-        width = self._width if self._width_configured else self.assigned_width
+        width = self._width if self._configured & WIDTH_CONFIGURED else self.assigned_width
 
         # height
-        height = self._height if self._height_configured else self.assigned_height
+        height = self._height if self._configured & HEIGHT_CONFIGURED else self.assigned_height
 
         return width.__floor__(), height.__floor__()
 
     def draw(self, surface: pg.Surface) -> None:
         """
-        draw the frame
+        draw the visible part of the frame (only re-renders if something changed)
+
+        frames that are outside the surfaces clip area (ex. outside their
+        parent or the window) are skipped together with all of their children
         """
         width, height = self.get_size()
-        # print("drawing: ", (width, height), self._x, self._y)
-        _surface = pg.Surface((width, height), pg.SRCALPHA)
+        visible = surface.get_clip().clip((self._x, self._y, width, height))
+
+        if not visible:
+            return
+
+        # the visible part in the frames own coordinates
+        area = visible.move(-self._x, -self._y)
+
+        if self._render_dirty or not self._rendered_area.contains(area):
+            self._render(area)
 
-        # draw the frame
+        surface.blit(self._surface, visible, area)
+
+    def _render(self, area: pg.Rect) -> None:
+        """
+        render a part of the frame and its children to the cached surface
+
+        :param area: the part to render (in the frames coordinates)
+        """
+        Frame.render_count += 1
+        width, height = self.get_size()
+
+        # only allocate a new surface if the size changed
+        if self._surface is ... or self._surface.get_size() != (width, height):
+            self._surface = pg.Surface((width, height), pg.SRCALPHA)
+
+        # everything outside the area is left as it is
+        self._surface.set_clip(area)
+        self._surface.fill((0, 0, 0, 0))
+
+        # draw the frame (pygame draws outlines relative to the clip area, so
+        # the border is the whole rect with the background inset into it)
+        config = self._display_config
+        radii = (config.ulr, config.urr, config.llr, config.lrr)
         r_rect = pg.Rect((0, 0, width, height))
+        color = config.bg.rgba
+
+        if config.border_width > 0:
+            self._draw_rect(config.border_color.rgba, r_rect, radii)
+
+            r_rect = r_rect.inflate(-2 * config.border_width, -2 * config.border_width)
+            radii = tuple([max(radius - config.border_width, 0) if radius > 0 else radius for radius in radii])
+
+        if r_rect.width > 0 and r_rect.height > 0:
+            self._draw_rect(color, r_rect, radii)
+
+        # draw children (children outside the area skip themselves, with many
+        # children only the ones in the area are looked at)
+        children = self._children
+        if len(children) > INDEXED_DRAW_MIN and area.width * area.height * 4 < width * height:
+            children = self.get_hit_index().overlapping(area)
+
+        for child in children:
+            child.draw(self._surface)
+
+        self._surface.set_clip(None)
+        self._rendered_area = area
+        self._render_dirty = False
+        self._damage_reported = False
+
+    def _draw_rect(self, color: tuple[int, int, int, int], rect: pg.Rect, radii: tuple[int, ...]) -> None:
+        """
+        draw a filled rect with rounded corners to the cached surface
+
+        :param radii: upper left, upper right, lower left and lower right radius
+        """
         pg.draw.rect(
-            _surface,
-            self._display_config.bg.rgba,
-            r_rect,
-            border_top_left_radius=self._display_config.ulr,
-            border_top_right_radius=self._display_config.urr,
-            border_bottom_left_radius=self._display_config.llr,
-            border_bottom_right_radius=self._display_config.lrr,
+            self._surface,
+            color,
+            rect,
+            border_top_left_radius=radii[0],
+            border_top_right_radius=radii[1],
+            border_bottom_left_radius=radii[2],
+            border_bottom_right_radius=radii[3],
         )
 
-        if self._display_config.border_width > 0:
-            pg.draw.rect(
-                _surface,
-                self._display_config.border_color.rgba,
-                r_rect,
-                width=self._display_config.border_width,
-                border_top_left_radius=self._display_config.ulr,
-                border_top_right_radius=self._display_config.urr,
-                border_bottom_left_radius=self._display_config.llr,
-                border_bottom_right_radius=self._display_config.lrr,
-            )
-
-        # draw children
-        for child, params in self._child_params:
-            child.draw(_surface)
-
-        # draw
-        surface.blit(_surface, (self._x, self._y))
-
     def place(
             self,
             x: int,
@@ -356,12 +577,112 @@ class Frame(GeometryManager):
 
         self.__parent.add_child(self, row=row, column=column, sticky=sticky, margin=margin)
 
+    # mouse events
+    def bind(self, event: str, callback: tp.Callable[[MouseEvent], tp.Any]) -> None:
+        """
+        call `callback` when the mouse does something with this frame
+
+        events without a callback are passed on to the parent (except for
+        ENTER and LEAVE)
+
+        :param event: one of PRESS, RELEASE, CLICK, MOTION, DRAG, WHEEL, ENTER or LEAVE
+        :param callback: gets passed a `MouseEvent`
+        """
+        if event not in MOUSE_EVENTS:
+            raise ValueError(f"Invalid mouse event: \"{event}\"")
+
+        if self._bindings is None:
+            self._bindings = {}
+
+        self._bindings.setdefault(event, []).append(callback)
+        self.report_binding(event, 1)
+
+    def unbind(self, event: str, callback: tp.Callable[[MouseEvent], tp.Any] = ...) -> None:
+        """
+        remove one (or all) callbacks of an event
+        """
+        if self._bindings is None or event not in self._bindings:
+            return
+
+        if callback is ...:
+            self.report_binding(event, -len(self._bindings.pop(event)))
+
+        else:
+            self._bindings[event].remove(callback)
+            self.report_binding(event, -1)
+
+            if not self._bindings[event]:
+                del self._bindings[event]
+
+    def is_bound(self, event: str) -> bool:
+        """
+        check if the frame has a callback for an event
+        """
+        return self._bindings is not None and event in self._bindings
+
+    def _drop_bindings(self) -> None:
+        """
+        remove all callbacks of this frame and its children
+        """
+        if self._bindings is not None:
+            for event, callbacks in self._bindings.items():
+                self.report_binding(event, -len(callbacks))
+
+            self._bindings = None
+
+        for child in self._children:
+            child._drop_bindings()
+
+    def handle_event(self, event: MouseEvent) -> None:
+        """
+        call the callbacks bound to the event (used by the root)
+        """
+        if self._bindings is None:
+            return
+
+        for callback in tuple(self._bindings.get(event.type, ())):
+            callback(event)
+
+    def lift(self) -> None:
+        """
+        draw the frame above its siblings
+        """
+        self.__parent.raise_child(self)
+
+    def lower(self) -> None:
+        """
+        draw the frame below its siblings
+        """
+        self.__parent.lower_child(self)
+
     def set_position(self, x: int, y: int) -> None:
         """
         set the child's position (used by parents)
         """
-        self._x = x
-        self._y = y
+        if x != self._x or y != self._y:
+            self._x = x
+            self._y = y
+
+            self.__parent.child_moved(self)
+
+    def arrange(self) -> None:
+        """
+        second layout pass, also tells the parent if the frame's area changed
+        """
+        if not self._layout_dirty:
+            return
+
+        super().arrange()
+
+        # the cached surface only has to be redrawn entirely if the size changed
+        # (compared to the surface itself, the parent may already know the new size)
+        if self._surface is ... or self._surface.get_size() != self.get_size():
+            self.invalidate_render()
+
+        # the size may have changed
+        parent = self.get_parent()
+        if parent is not None:
+            parent.child_moved(self)
 
     def set_size(self, width: float, height: float) -> None:
         """
@@ -374,8 +695,21 @@ class Frame(GeometryManager):
         """
         delete the widget
         """
+        parent = self.get_parent()
+
+        # (while still attached, so the root knows which events aren't needed anymore)
+        self._drop_bindings()
+
+        # detach from the parent, so it doesn't lay out or draw this frame anymore
+        if parent is not None and parent.has_child(self):
+            parent.remove_child(self)
+
         self.__parent = ...
+        self._theme.notify_off(self._subscription)
 
-        # terminate all children
-        for child in self._children:
+        # terminate all children (they don't have to detach from this frame anymore)
+        children = tuple(self._children)
+        self._children.clear()
+
+        for child in children:
             child.delete()
@@ -7,26 +7,118 @@ How children are placed
 Author:
 Nilusink
 """
-from ..types import Absolute, Pack, Grid, BetterDict, TOP, BOTTOM, LEFT, RIGHT
+from ..types import Absolute, Pack, Grid, Record, TOP, BOTTOM, LEFT, RIGHT
 from ._supports_children import SupportsChildren
-from copy import deepcopy
+from ..utils import SpatialIndex
+from collections import OrderedDict
 import typing as tp
 
 
+# bits of `GeometryManager._configured` (subclasses use the higher ones)
+WIDTH_CONFIGURED: int = 1 << 0
+HEIGHT_CONFIGURED: int = 1 << 1
+
+
+class LayoutParams(Record):
+    """
+    how a container spaces its children
+    """
+    __slots__ = ("margin", "padding")
+    margin: int
+    padding: int
+
+    def __init__(self, margin: int = 0, padding: int = 0) -> None:
+        self.margin = margin
+        self.padding = padding
+
+
+class PlaceParams(Record):
+    """
+    where a child is placed in an `Absolute` container
+    """
+    __slots__ = ("x", "y")
+    x: int
+    y: int
+
+    def __init__(self, x: int = 0, y: int = 0) -> None:
+        self.x = x
+        self.y = y
+
+
+class PackParams(Record):
+    """
+    where a child is packed in a `Pack` container
+    """
+    __slots__ = ("anchor",)
+    anchor: str
+
+    def __init__(self, anchor: str = TOP) -> None:
+        self.anchor = anchor
+
+
+class GridParams(Record):
+    """
+    where a child is placed in a `Grid` container
+    """
+    __slots__ = ("row", "column", "sticky", "margin")
+    row: int
+    column: int
+    sticky: str
+    margin: int
+
+    def __init__(self, row: int = 0, column: int = 0, sticky: str = "", margin: int = 0) -> None:
+        self.row = row
+        self.column = column
+        self.sticky = sticky
+        self.margin = margin
+
+
+CHILD_PARAMS: dict[int, type[Record]] = {
+    Absolute: PlaceParams,
+    Pack: PackParams,
+    Grid: GridParams,
+}
+
+
 class GeometryManager(SupportsChildren):
     """
     Manages how children are placed inside a parent container
     """
-    _layout: int = Absolute
-    _width: float = 0   # -1 means not configured -> takes minimum size required by its children
-    _height: float = 0  # or the size it gets by the parents geometry manager
-    assigned_width: float = 0
-    assigned_height: float = 0
-    _width_configured: bool = False
-    _height_configured: bool = False
-    _child_params: list[tuple[tp.Any, BetterDict]] = ...
-    layout_params: BetterDict = ...
-    _grid_params: BetterDict = ...
+    __slots__ = (
+        "_layout",
+        "_width",
+        "_height",
+        "assigned_width",
+        "assigned_height",
+        "_configured",
+        "layout_params",
+        "_grid_row_config",
+        "_grid_column_config",
+        "_layout_dirty",
+        "_measure_dirty",
+        "_desired_size",
+        "_min_size",
+        "_grid_tracks",
+        "_hit_index",
+    )
+    _layout: int
+    _width: float   # -1 means not configured -> takes minimum size required by its children
+    _height: float  # or the size it gets by the parents geometry manager
+    assigned_width: float
+    assigned_height: float
+    _configured: int  # which values have been set by the user (bitmask)
+    _children: OrderedDict[tp.Any, Record]  # child -> its placement parameters
+    layout_params: LayoutParams
+    _grid_row_config: dict[int, float] | None  # the weights set by `grid_rowconfigure`
+    _grid_column_config: dict[int, float] | None
+    _layout_dirty: bool
+    _measure_dirty: bool
+    _desired_size: tuple[int, int]
+    _min_size: tuple[float, float]
+    # minimal size of each row / column and their weights
+    _grid_tracks: tuple[list[float], list[float], list[float], list[float]] | None
+    _hit_index: SpatialIndex | None  # the children by position (only built when needed)
+    layout_count: int = 0  # how many containers have been arranged (all instances)
 
     def __init__(
             self,
@@ -37,15 +129,20 @@ class GeometryManager(SupportsChildren):
         super().__init__()
 
         self._layout = Absolute if layout is ... else layout
-        self.layout_params = BetterDict({
-            "margin": margin,
-            "padding": padding
-        })
-        self._child_params = []
-        self._grid_params = BetterDict({
-            "rows": {},
-            "columns": {}
-        })
+        self._width = 0
+        self._height = 0
+        self.assigned_width = 0
+        self.assigned_height = 0
+        self._configured = 0
+        self.layout_params = LayoutParams(margin, padding)
+        self._grid_row_config = None
+        self._grid_column_config = None
+        self._layout_dirty = True
+        self._measure_dirty = True
+        self._desired_size = (0, 0)
+        self._min_size = (0, 0)
+        self._grid_tracks = None
+        self._hit_index = None
 
     @property
     def layout(self) -> int:
@@ -61,7 +158,8 @@ class GeometryManager(SupportsChildren):
     @width.setter
     def width(self, value: float) -> None:
         self._width = value
-        self._width_configured = True
+        self._configured |= WIDTH_CONFIGURED
+        self.invalidate_layout()
 
     @property
     def height(self) -> float:
@@ -70,7 +168,84 @@ class GeometryManager(SupportsChildren):
     @height.setter
     def height(self, value: float) -> None:
         self._height = value
-        self._height_configured = True
+        self._configured |= HEIGHT_CONFIGURED
+        self.invalidate_layout()
+
+    @property
+    def layout_dirty(self) -> bool:
+        """
+        true if the container needs a new layout pass
+        """
+        return self._layout_dirty
+
+    # layout invalidation
+    def get_parent(self) -> tp.Optional["GeometryManager"]:
+        """
+        the container this one is placed in (None if there is none)
+        """
+        return None
+
+    def invalidate_layout(self) -> None:
+        """
+        mark this container and all of its ancestors as needing a new layout pass
+        """
+        # a container that needs measuring always has ancestors that need it too,
+        # so stop at the first one
+        node = self
+        while node is not None and not node._measure_dirty:
+            node._measure_dirty = True
+            node._layout_dirty = True
+            node = node.get_parent()
+
+    def invalidate_render(self) -> None:
+        """
+        mark the containers rendering as outdated (containers that don't
+        cache their rendering have nothing to invalidate)
+        """
+
+    def report_damage(self, widget: tp.Any) -> None:
+        """
+        tell the container that the screen area of `widget` has to be redrawn
+        (passed on to the root, which collects them)
+        """
+        parent = self.get_parent()
+
+        if parent is not None:
+            parent.report_damage(widget)
+
+    def report_area(self, rect: tuple[int, int, int, int]) -> None:
+        """
+        tell the container that a part of it (in its own coordinates) has to
+        be redrawn (containers that don't draw have nothing to redraw)
+        """
+
+    def report_binding(self, event: str, count: int) -> None:
+        """
+        tell the container that `count` callbacks for a mouse event have been
+        bound (or unbound if negative) somewhere below it (passed on to the root)
+        """
+        parent = self.get_parent()
+
+        if parent is not None:
+            parent.report_binding(event, count)
+
+    def get_abs_position(self) -> tuple[float, float]:
+        """
+        the containers position on the screen
+        """
+        return 0, 0
+
+    def assign_size(self, width: float, height: float) -> None:
+        """
+        set the size the parents geometry manager assigns (used by parents)
+
+        the desired size doesn't depend on the assigned one, so only the
+        arrangement of the children has to be redone
+        """
+        if width != self.assigned_width or height != self.assigned_height:
+            self.assigned_width = width
+            self.assigned_height = height
+            self._layout_dirty = True
 
     # layout configuration
     def set_layout(self, layout: int) -> None:
@@ -80,16 +255,15 @@ class GeometryManager(SupportsChildren):
         if layout not in (Absolute, Pack, Grid):
             raise ValueError("Invalid container layout: ", layout)
 
-        if len(self._child_params) > 0:
+        if len(self._children) > 0:
             # if children are already present, delete them
-            for child, _param in self._child_params:
+            for child in tuple(self._children):
                 child.delete()
 
-            self._child_params.clear()
-
             raise RuntimeWarning("changing layout with children already present!")
 
         self._layout = layout
+        self.invalidate_layout()
 
     def grid_columnconfigure(self, column: int | tp.Iterable[int], weight: float = 1) -> None:
         """
@@ -102,9 +276,11 @@ class GeometryManager(SupportsChildren):
 
             return
 
-        self._grid_params["columns"][column] = {
-            "weight": weight
-        }
+        if self._grid_column_config is None:
+            self._grid_column_config = {}
+
+        self._grid_column_config[column] = weight
+        self.invalidate_layout()
 
     def grid_rowconfigure(self, row: int | tp.Iterable[int], weight: float = 1) -> None:
         """
@@ -117,313 +293,442 @@ class GeometryManager(SupportsChildren):
 
             return
 
-        self._grid_params["rows"][row] = {
-            "weight": weight
-        }
+        if self._grid_row_config is None:
+            self._grid_row_config = {}
+
+        self._grid_row_config[row] = weight
+        self.invalidate_layout()
 
     # other stuff
     def add_child(self, child: tp.Any, **params) -> None:
         """
-        add a child to the collection
+        add a child to the collection (or update where it is placed)
+        """
+        super().add_child(child, CHILD_PARAMS[self._layout](**params))
+        self.invalidate_layout()
+
+        if self._hit_index is not None:
+            self._hit_index.insert(child, child.get_hit_rect())
+
+    def remove_child(self, child: tp.Any) -> Record:
+        """
+        remove a child from the collection (only this container has to be laid out again)
+        """
+        params = super().remove_child(child)
+
+        if self._hit_index is not None:
+            self._hit_index.remove(child)
+
+        self.invalidate_layout()
+        self.invalidate_render()
+
+        return params
+
+    def raise_child(self, child: tp.Any) -> None:
+        """
+        draw a child above all others
+        """
+        super().raise_child(child)
+
+        if self._hit_index is not None:
+            self._hit_index.raise_item(child)
+
+        # the z-order is also the order children are packed in
+        if self._layout == Pack:
+            self.invalidate_layout()
+
+        self.report_damage(child)
+        self.invalidate_render()
+
+    def lower_child(self, child: tp.Any) -> None:
+        """
+        draw a child below all others
+        """
+        super().lower_child(child)
+
+        if self._hit_index is not None:
+            self._hit_index.lower_item(child)
+
+        # the z-order is also the order children are packed in
+        if self._layout == Pack:
+            self.invalidate_layout()
+
+        self.report_damage(child)
+        self.invalidate_render()
+
+    # hit testing
+    def widget_at(self, x: float, y: float) -> tp.Any | None:
+        """
+        the topmost widget at a position (relative to this container)
+
+        :return: the widget or None if there is no child at that position
+        """
+        child = self.get_hit_index().at(x, y)
+
+        if child is None:
+            return None
+
+        found = child.widget_at(x - child._x, y - child._y)
+        return child if found is None else found
+
+    def get_hit_index(self) -> SpatialIndex:
+        """
+        the children indexed by the area they cover (built on first use and
+        kept up-to-date from then on)
+        """
+        if self._hit_index is None:
+            self._hit_index = SpatialIndex()
+
+            for child in self._children:
+                self._hit_index.insert(child, child.get_hit_rect())
+
+        return self._hit_index
+
+    def child_moved(self, child: tp.Any) -> None:
+        """
+        tell the container that one of its children moved or changed size (used by children)
+
+        only the area the child covered before and the one it covers now
+        have to be redrawn
         """
-        if child not in self._children:
-            super().add_child(child)
-            self._child_params.append((child, BetterDict(params)))
+        rect = child.get_hit_rect()
+        old_rect = child._placed_rect
+
+        if rect == old_rect:
+            return
+
+        child._placed_rect = rect
+
+        if self._hit_index is not None and child in self._hit_index:
+            self._hit_index.update(child, rect)
+
+        if old_rect is not None:
+            self.report_area(old_rect)
+
+        self.report_area(rect)
 
     def calculate_geometry(self):
         """
         calculate how each individual child should be placed
+
+        runs both layout passes, clean containers (and with them their whole
+        subtree) keep the positions and sizes of the last pass
         """
+        self.measure()
+        self.arrange()
+
+    def calculate_size(self) -> tuple[int, int]:
+        """
+        calculate how big the container should be
+        """
+        return self.measure()
+
+    def measure(self) -> tuple[int, int]:
+        """
+        first layout pass (bottom-up): calculate and store how big the container
+        wants to be, based on the stored sizes of its children
+
+        :return: the desired size
+        """
+        if not self._measure_dirty:
+            return self._desired_size
+
         match self._layout:
             case 0:  # Absolute
                 # since the positioning is absolute, the children should not influence the parents size
-                for child, params in self._child_params:
-                    child.set_position(params.x, params.y)
+                for child in self._children:
+                    child.measure()
 
             case 1:  # pack
-                directional_dict: dict[str, int | list] = {"total_x": 0, "total_y": 0, "children": [], "sizes": []}
-                top = deepcopy(directional_dict)
-                bottom = deepcopy(directional_dict)
-                left = deepcopy(directional_dict)
-                right = deepcopy(directional_dict)
-
-                # get all sizes and group by anchor
-                for child, param in self._child_params:
-                    child_size = child.calculate_size()
-
-                    if param.anchor == TOP:
-                        top["children"].append(child)
-                        top["sizes"].append(child_size)
-                        top["total_x"] += child_size[0]
-                        top["total_y"] += child_size[1]
-
-                    elif param.anchor == BOTTOM:
-                        bottom["children"].append(child)
-                        bottom["sizes"].append(child_size)
-                        bottom["total_x"] += child_size[0]
-                        bottom["total_y"] += child_size[1]
-
-                    elif param.anchor == LEFT:
-                        left["children"].append(child)
-                        left["sizes"].append(child_size)
-                        left["total_x"] += child_size[0]
-                        left["total_y"] += child_size[1]
-
-                    elif param.anchor == RIGHT:
-                        right["children"].append(child)
-                        right["sizes"].append(child_size)
-                        right["total_x"] += child_size[0]
-                        right["total_y"] += child_size[1]
-
-                top["total_y"] += self.layout_params.padding * len(top["children"]) - 1
-                bottom["total_y"] += self.layout_params.padding * len(bottom["children"]) - 1
-
-                left["total_x"] += self.layout_params.padding * len(left["children"]) - 1
-                right["total_x"] += self.layout_params.padding * len(right["children"]) - 1
-
-                # if not configured, set own size
-                total_x = max([top["total_x"], bottom["total_x"], left["total_x"] + right["total_x"]])
-                total_y = max([left["total_y"], right["total_y"], top["total_y"] + bottom["total_y"]])
-
-                # add margin
-                total_x += self.layout_params.margin * 2
-                total_y += self.layout_params.margin * 2
-
-                if not self._width_configured:
-                    self._width = total_x
-
-                else:
-                    total_x = self._width
-    
-                if not self._height_configured:
-                    self._height = total_y
-
-                else:
-                    total_y = self.height
-
-                # tell the children where they should be
-                y_cen = total_y / 2
-                x_cen = total_x / 2
-
-                # left
-                x_now = self.layout_params.margin
-                for child, size in zip(left["children"], left["sizes"]):
-                    child.set_position(x_now, y_cen - size[1] / 2)
-                    x_now += size[0] + self.layout_params.padding
-
-                # right
-                x_now = total_x - self.layout_params.margin
-                for child, size in zip(right["children"], right["sizes"]):
-                    child.set_position(x_now - size[0], y_cen - size[1] / 2)
-                    x_now -= size[0] + self.layout_params.padding
-
-                # top
-                y_now = self.layout_params.margin
-                for child, size in zip(top["children"], top["sizes"]):
-                    child.set_position(x_cen - size[0] / 2, y_now)
-                    y_now += size[1] + self.layout_params.padding
-
-                # bottom
-                y_now = total_y - self.layout_params.margin
-                for child, size in zip(bottom["children"], bottom["sizes"]):
-                    child.set_position(x_cen - size[0] / 2, y_now - size[1])
-                    y_now -= size[1] + self.layout_params.padding
+                self._measure_pack()
 
             case 2:  # grid
-                rows: list[dict[str, tp.Any | float]] = []
-                columns: list[dict[str, tp.Any | float]] = []
+                self._measure_grid()
 
-                for child, params in self._child_params:
-                    row, column = params["row"], params["column"]
+            case _:
+                raise ValueError(f"Invalid geometry type: {self._layout}")
 
-                    # if row was not yet made, make all previous ones
-                    if len(rows) <= row:
-                        for n_row in range(len(rows), row+1):
-                            out = {
-                                "weight": 0,
-                                "children": []
-                            }
+        self._desired_size = round(self._width), round(self._height)
+        self._measure_dirty = False
 
-                            if n_row in self._grid_params.rows:
-                                config = self._grid_params.rows[n_row]
+        return self._desired_size
 
-                                if "weight" in config:
-                                    out["weight"] = config["weight"]
+    def arrange(self) -> None:
+        """
+        second layout pass (top-down): place the children using the sizes
+        stored by `measure`
+        """
+        if not self._layout_dirty:
+            return
 
-                            rows.append(out)
+        GeometryManager.layout_count += 1
 
-                    if len(columns) <= column:
-                        for n_col in range(len(columns), column+1):
-                            out = {
-                                "weight": 0,
-                                "children": []
-                            }
+        match self._layout:
+            case 0:  # Absolute
+                for child, params in self._children.items():
+                    child.set_position(params.x, params.y)
 
-                            if n_col in self._grid_params.columns:
-                                config = self._grid_params.columns[n_col]
+            case 1:  # pack
+                self._arrange_pack()
 
-                                if "weight" in config:
-                                    out["weight"] = config["weight"]
+            case 2:  # grid
+                self._arrange_grid()
 
-                            columns.append(out)
+            case _:
+                raise ValueError(f"Invalid geometry type: {self._layout}")
 
-                    rows[row]["children"].append((child, params))
-                    columns[column]["children"].append((child, params))
+        # only children that changed (or got a new size assigned) do any work here
+        # (children that moved or changed their size report it with `child_moved`)
+        for child in self._children:
+            child.arrange()
 
-                matrix: list[list] = []
+        self._layout_dirty = False
 
-                for r in range(len(rows)):
-                    matrix.append([])
+    def _layout_area(self) -> tuple[float, float]:
+        """
+        the space the children can be arranged in
+        """
+        if self._layout == Pack:
+            return self._width, self._height
 
-                    for c in range(len(columns)):
-                        # child = set(rows[r]["children"]) & set(columns[c]["children"])
-                        child = [chi for chi in rows[r]["children"] if chi in columns[c]["children"]]
-                        child = list(child)
+        return self.assigned_width, self.assigned_height
 
-                        if len(child) > 1:
-                            raise ValueError(f"{len(child)} children assigned to row {r} column {c}!")
+    # pack
+    def _measure_pack(self) -> None:
+        """
+        calculate the containers minimal size from the sizes of its children
 
-                        if child:
-                            matrix[r].append(child[0])
+        only sums per anchor are kept (no per-pass lists), `_arrange_pack`
+        reads the sizes the children stored while being measured
+        """
+        padding = self.layout_params.padding
+        margin = self.layout_params.margin
 
-                        else:
-                            matrix[r].append(...)
+        top_x = top_y = bottom_x = bottom_y = left_x = left_y = right_x = right_y = 0
+        n_top = n_bottom = n_left = n_right = 0
 
-                # calculate the minimal size for each row
-                for r, row in enumerate(rows):
-                    rows[r]["max_size"] = 0
+        # get all sizes and sum them up by anchor
+        for child, param in self._children.items():
+            width, height = child.measure()
+            anchor = param.anchor
 
-                    for child, params in row["children"]:
-                        _, y = child.calculate_size()
+            if anchor == TOP:
+                top_x += width
+                top_y += height
+                n_top += 1
 
-                        y += 2 * params.margin
+            elif anchor == BOTTOM:
+                bottom_x += width
+                bottom_y += height
+                n_bottom += 1
 
-                        if y > rows[r]["max_size"]:
-                            rows[r]["max_size"] = y
+            elif anchor == LEFT:
+                left_x += width
+                left_y += height
+                n_left += 1
 
-                    # calculate the minimal size for each column
-                for c, column in enumerate(columns):
-                    columns[c]["max_size"] = 0
+            elif anchor == RIGHT:
+                right_x += width
+                right_y += height
+                n_right += 1
 
-                    for child, params in column["children"]:
-                        x, _ = child.calculate_size()
+        # padding only goes between the children of an anchor
+        top_y += padding * max(n_top - 1, 0)
+        bottom_y += padding * max(n_bottom - 1, 0)
 
-                        x += 2 * params.margin
+        left_x += padding * max(n_left - 1, 0)
+        right_x += padding * max(n_right - 1, 0)
 
-                        if x > columns[c]["max_size"]:
-                            columns[c]["max_size"] = x
+        total_x = max(top_x, bottom_x, left_x + right_x)
+        total_y = max(left_y, right_y, top_y + bottom_y)
 
-                # calculate the container size
-                width, height = self.assigned_width, self.assigned_height
+        # add margin
+        total_x += margin * 2
+        total_y += margin * 2
 
-                # only subtract rows that don't have a weight
-                min_width = sum([c["max_size"] for c in columns])
-                min_height = sum([r["max_size"] for r in rows])
+        self._min_size = total_x, total_y
 
-                # assign extra space
-                extra_width = width - sum([c["max_size"] for c in columns if c["weight"] == 0])
-                extra_height = height - sum([r["max_size"] for r in rows if r["weight"] == 0])
+        # if not configured, set own size
+        if not self._configured & WIDTH_CONFIGURED:
+            self._width = total_x
 
-                total_row_weight = sum([row["weight"] for row in rows])
-                total_column_weight = sum([column["weight"] for column in columns])
+        if not self._configured & HEIGHT_CONFIGURED:
+            self._height = total_y
 
-                # print(f"\n\nwindow_size=[{width}, {height}]\tmin_size={[min_width, min_height]}")
-                # print(f"{total_row_weight=}")
-                # print(f"{total_column_weight=}")
-                # print(f"{extra_height=}")
-                # print(f"{extra_width=}")
+    def _arrange_pack(self) -> None:
+        """
+        tell the children where they should be (each anchor stacks its
+        children in the order they were added)
+        """
+        total_x, total_y = self._layout_area()
+        padding = self.layout_params.padding
+        margin = self.layout_params.margin
 
-                # assign each row and column a specific size
-                for r in range(len(rows)):
-                    if total_row_weight == 0:
-                        rows[r]["height"] = 0
-                    else:
-                        # assign either the minimum size or the calculated dynamic one
-                        w_size = ((rows[r]["weight"] / total_row_weight) * extra_height).__floor__()
-                        rows[r]["height"] = max([w_size, rows[r]["max_size"]])
-                        # print(f"{w_size=}\t{rows[r]['max_size']=}")
+        y_cen = total_y / 2
+        x_cen = total_x / 2
 
-                    # rows[r]["height"] += rows[r]["max_size"]
-                    rows[r]["y_start"] = sum([prev_row["height"] for prev_row in rows[:r]])
+        left = top = margin
+        right = total_x - margin
+        bottom = total_y - margin
 
-                    for c in range(len(columns)):
-                        if total_column_weight == 0:
-                            columns[c]["width"] = 0
-                        else:
-                            # assign either the minimum size or the calculated dynamic one
-                            w_size = ((columns[c]["weight"] / total_column_weight) * extra_width).__floor__()
-                            columns[c]["width"] = max([w_size, columns[c]["max_size"]])
-                            # print(f"{w_size=}\t{columns[c]['max_size']=}")
+        for child, param in self._children.items():
+            width, height = child._desired_size
+            anchor = param.anchor
 
-                        # columns[c]["width"] += columns[c]["max_size"]
-                        columns[c]["x_start"] = sum([prev_col["width"] for prev_col in columns[:c]])
+            if anchor == LEFT:
+                child.set_position(left, y_cen - height / 2)
+                left += width + padding
 
-                # place children
-                for child, params in self._child_params:
-                    # place the child proportional to the table and stickiness
-                    # size = list(child.calculate_size())
-                    size = [child._width, child._height]
+            elif anchor == RIGHT:
+                child.set_position(right - width, y_cen - height / 2)
+                right -= width + padding
 
-                    row, column = params["row"], params["column"]
-                    sticky = params["sticky"]
+            elif anchor == TOP:
+                child.set_position(x_cen - width / 2, top)
+                top += height + padding
 
-                    width = columns[column]["width"]
-                    height = rows[row]["height"]
+            elif anchor == BOTTOM:
+                child.set_position(x_cen - width / 2, bottom - height)
+                bottom -= height + padding
 
-                    x = columns[column]["x_start"]
-                    y = rows[row]["y_start"]
+    # grid
+    def _measure_grid(self) -> None:
+        """
+        index the children by cell and calculate the minimal size of each row and column
+        """
+        cells: dict[tuple[int, int], tp.Any] = {}
+        rows: list[float] = []
+        columns: list[float] = []
 
-                    x_cen = x + width / 2
-                    y_cen = y + height / 2
+        for child, params in self._children.items():
+            row, column = params.row, params.column
 
-                    x_diff = width - size[0]
-                    y_diff = height - size[1]
+            if (row, column) in cells:
+                raise ValueError(f"2 children assigned to row {row} column {column}!")
 
-                    # print(f"calc: {x_diff}, {y_diff}\t{size}\t{width},{height}")
-                    # print(f"{sticky=}")
+            cells[row, column] = child
 
-                    box_x = x_cen - size[0] / 2
-                    box_y = y_cen - size[1] / 2
+            # if row was not yet made, make all previous ones
+            if len(rows) <= row:
+                rows.extend([0] * (row + 1 - len(rows)))
 
-                    # assign stickiness
-                    if not child._width_configured:
-                        if "w" in sticky:
-                            size[0] += (x_diff / 2) - params.margin
-                            box_x = x + params.margin
+            if len(columns) <= column:
+                columns.extend([0] * (column + 1 - len(columns)))
 
-                        if "e" in sticky:
-                            size[0] += (x_diff / 2) - params.margin
+            # the biggest child (including its margin) defines the minimal size
+            x, y = child.measure()
 
-                        child.assigned_width = size[0]
+            x += 2 * params.margin
+            y += 2 * params.margin
 
-                    if not child._height_configured:
-                        if "n" in sticky:
-                            size[1] += (y_diff / 2) - params.margin
-                            box_y = y + params.margin
-                            # print("north: ", size, box_x, box_y, "\t\t", width, height)
+            if x > columns[column]:
+                columns[column] = x
 
-                        if "s" in sticky:
-                            size[1] += (y_diff / 2) - params.margin
-                            # print("south: ", size, box_x, box_y, "\t\t", width, height)
+            if y > rows[row]:
+                rows[row] = y
 
-                        child.assigned_height = size[1]
+        row_config = self._grid_row_config or {}
+        column_config = self._grid_column_config or {}
 
-                    child.set_position(box_x, box_y)
+        self._grid_tracks = (
+            rows,
+            columns,
+            [row_config.get(r, 0) for r in range(len(rows))],
+            [column_config.get(c, 0) for c in range(len(columns))],
+        )
 
-            case _:
-                raise ValueError(f"Invalid geometry type: {self._layout}")
+        self._min_size = sum(columns), sum(rows)
 
-    def calculate_size(self) -> tuple[int, int]:
+    def _arrange_grid(self) -> None:
         """
-        calculate how big the container should be
+        distribute the available space and place the children in their cells
         """
-        # make sure the geometry is up-to-date
-        self.calculate_geometry()
+        width, height = self._layout_area()
+        rows, columns, row_weights, column_weights = self._grid_tracks
+
+        column_widths, column_starts = _distribute_space(columns, column_weights, width)
+        row_heights, row_starts = _distribute_space(rows, row_weights, height)
+
+        # place children
+        for child, params in self._children.items():
+            # place the child proportional to the table and stickiness
+            size = [child._width, child._height]
+
+            row, column = params.row, params.column
+            sticky = params.sticky
+
+            width = column_widths[column]
+            height = row_heights[row]
+
+            x = column_starts[column]
+            y = row_starts[row]
+
+            x_cen = x + width / 2
+            y_cen = y + height / 2
+
+            x_diff = width - size[0]
+            y_diff = height - size[1]
+
+            box_x = x_cen - size[0] / 2
+            box_y = y_cen - size[1] / 2
+
+            # assign stickiness
+            assigned_width, assigned_height = child.assigned_width, child.assigned_height
+            if not child._configured & WIDTH_CONFIGURED:
+                if "w" in sticky:
+                    size[0] += (x_diff / 2) - params.margin
+                    box_x = x + params.margin
+
+                if "e" in sticky:
+                    size[0] += (x_diff / 2) - params.margin
+
+                assigned_width = size[0]
+
+            if not child._configured & HEIGHT_CONFIGURED:
+                if "n" in sticky:
+                    size[1] += (y_diff / 2) - params.margin
+                    box_y = y + params.margin
+
+                if "s" in sticky:
+                    size[1] += (y_diff / 2) - params.margin
+
+                assigned_height = size[1]
+
+            child.assign_size(assigned_width, assigned_height)
+            child.set_position(box_x, box_y)
+
+
+def _distribute_space(
+        min_sizes: list[float],
+        weights: list[float],
+        available: float
+) -> tuple[list[float], list[float]]:
+    """
+    assign each row / column a specific size
+
+    :param min_sizes: the minimal size of each row / column
+    :param weights: how much of the extra space each row / column gets
+    :param available: the space the grid can use
+    :return: the sizes and the start positions (prefix sums of the sizes)
+    """
+    total_weight = sum(weights)
+
+    # only subtract rows / columns that don't have a weight
+    extra = available - sum([size for size, weight in zip(min_sizes, weights) if weight == 0])
+
+    sizes: list[float] = []
+    starts: list[float] = []
+    start = 0
+    for min_size, weight in zip(min_sizes, weights):
+        if total_weight == 0:
+            size = 0
 
-        width = self._width
-        height = self._height
+        else:
+            # assign either the minimum size or the calculated dynamic one
+            size = max([((weight / total_weight) * extra).__floor__(), min_size])
 
-        width = round(width)
-        height = round(height)
+        sizes.append(size)
+        starts.append(start)
+        start += size
 
-        return width, height
+    return sizes, starts
@@ -7,17 +7,60 @@ All widgets which support parenting should inherit this
 Author:
 Nilusink
 """
+from collections import OrderedDict
 import typing as tp
 
 
 class SupportsChildren:
-    _children: list[tp.Any] = ...
+    """
+    keeps the children and their placement parameters
+
+    the order of the children is their z-order: the first one is drawn first
+    (at the bottom), the last one on top
+    """
+    __slots__ = ("_children", "__weakref__")
+    _children: OrderedDict[tp.Any, tp.Any]  # child -> its parameters
 
     def __init__(self) -> None:
-        self._children = []
+        self._children = OrderedDict()
+
+    @property
+    def children(self) -> tuple[tp.Any, ...]:
+        """
+        all children, from bottom to top
+        """
+        return tuple(self._children)
+
+    def has_child(self, child: tp.Any) -> bool:
+        return child in self._children
+
+    def add_child(self, child: tp.Any, params: tp.Any = None) -> None:
+        """
+        add a child to the collection (on top of the others), adding a child
+        again only replaces its parameters
+        """
+        self._children[child] = params
+
+    def remove_child(self, child: tp.Any) -> tp.Any:
+        """
+        remove a child from the collection
+
+        :return: the child's parameters
+        """
+        try:
+            return self._children.pop(child)
+
+        except KeyError:
+            raise ValueError(f"{child} is not a child of {self}") from None
+
+    def raise_child(self, child: tp.Any) -> None:
+        """
+        move a child to the top of the z-order
+        """
+        self._children.move_to_end(child)
 
-    def add_child(self, child: tp.Any) -> None:
+    def lower_child(self, child: tp.Any) -> None:
         """
-        add a child to the collection
+        move a child to the bottom of the z-order
         """
-        self._children.append(child)
+        self._children.move_to_end(child, last=False)
@@ -0,0 +1,17 @@
+"""
+conftest.py
+18. October 2026
+
+headless setup shared by all tests
+
+Author:
+Nilusink
+"""
+import os
+import sys
+
+# no display server required
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
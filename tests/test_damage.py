@@ -0,0 +1,171 @@
+"""
+test_damage.py
+18. October 2026
+
+redrawing only the damaged parts of the screen (and re-rendering only the
+outdated cached surfaces) gives the same picture as redrawing everything
+
+Author:
+Nilusink
+"""
+from pginter.widgets import Frame
+from pginter.types import *
+from pginter import PgRoot
+import typing as tp
+import pygame as pg
+import pytest
+import random
+
+
+SIZE: tuple[int, int] = (300, 200)
+STEPS: int = 40
+
+
+def _walk(node: tp.Any) -> tp.Iterator[tp.Any]:
+    yield node
+
+    for child in node.children:
+        yield from _walk(child)
+
+
+def _run(seed: int, damage_tracking: bool, reference: bool) -> list[bytes]:
+    """
+    build a random tree and change it randomly, capturing the screen after every step
+
+    :param reference: re-render every frame from scratch (ignores all caches)
+    """
+    rnd = random.Random(seed)
+    root = PgRoot(size=SIZE, damage_tracking=damage_tracking, headless=True)
+    frames: list[Frame] = []
+
+    def make(parent: tp.Any, depth: int) -> None:
+        frame = Frame(
+            parent,
+            width=rnd.randint(10, 200),
+            height=rnd.randint(10, 150),
+            bg_color=Color(rnd.randint(0, 255), rnd.randint(0, 255), rnd.randint(0, 255), rnd.choice((255, 128))),
+            border_radius=rnd.choice((0, 5)),
+            border_width=rnd.choice((0, 0, 3)),
+            border_color=Color(0, 255, 0, 255),
+            padding=rnd.randint(0, 3),
+        )
+
+        if parent.layout == Pack:
+            frame.pack(rnd.choice((TOP, BOTTOM, LEFT, RIGHT)))
+
+        else:
+            frame.place(rnd.randint(-80, 280), rnd.randint(-80, 180))
+
+        frames.append(frame)
+
+        if depth < 3:
+            if rnd.random() < .5:
+                frame.set_layout(Pack)
+
+            for _ in range(rnd.randint(0, 3)):
+                make(frame, depth + 1)
+
+    for _ in range(5):
+        make(root, 0)
+
+    shots = []
+    for _step in range(STEPS):
+        for _ in range(rnd.randint(1, 3)):
+            alive = [frame for frame in frames if frame.get_parent() is not None]
+            frame = rnd.choice(alive)
+
+            match rnd.randrange(8):
+                case 0:
+                    frame.configure(bg_color=Color(rnd.randint(0, 255), 0, rnd.randint(0, 255), 255))
+
+                case 1 if frame.get_parent().layout == Absolute:
+                    frame.place(rnd.randint(-80, 280), rnd.randint(-80, 180))
+
+                case 2:
+                    frame.configure(width=rnd.randint(5, 200))
+
+                case 3:
+                    frame.configure(height=rnd.randint(5, 150))
+
+                case 4:
+                    frame.configure(margin=rnd.randint(0, 5))
+
+                case 5:
+                    frame.lift()
+
+                case 6:
+                    frame.lower()
+
+                case 7 if len(alive) > 5 and not frame.children:
+                    frame.delete()
+
+        if reference:
+            for node in _walk(root):
+                if isinstance(node, Frame):
+                    node._render_dirty = True
+
+            root._full_redraw = True
+
+        root.update_screen()
+        shots.append(pg.image.tobytes(root.surface, "RGBA"))
+
+    return shots
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("damage_tracking", (True, False))
+def test_cached_redraw_matches_full_redraw(seed: int, damage_tracking: bool) -> None:
+    expected = _run(seed, False, True)
+    got = _run(seed, damage_tracking, False)
+
+    for step, (shot, reference) in enumerate(zip(got, expected)):
+        assert shot == reference, f"step {step} differs"
+
+
+def test_shrunk_and_moved_frame_is_rendered_again() -> None:
+    """
+    a packed frame that shrinks moves in the same layout pass
+    """
+    root = PgRoot(size=(200, 200), headless=True)
+    root.set_layout(Pack)
+
+    frame = Frame(root, width=100, height=100, border_width=3, border_color=Color(0, 255, 0, 255))
+    frame.pack(LEFT)
+    root.update_screen()
+
+    frame.height = 50
+    root.update_screen()
+
+    rect = frame.get_abs_rect()
+    assert frame._surface.get_size() == (100, 50)
+    assert root.surface.get_at((rect.centerx, rect.bottom - 1)) == (0, 255, 0, 255)
+
+
+def test_recolor_damages_only_the_widget() -> None:
+    """
+    changing how one tile looks doesn't damage the containers around it
+    """
+    root = PgRoot(size=(800, 600), headless=True)
+    root.set_layout(Grid)
+    root.grid_rowconfigure(0, weight=1)
+    root.grid_columnconfigure(0, weight=1)
+
+    outer = Frame(root, layout=Grid)
+    outer.grid(0, 0, sticky="nsew")
+
+    tiles = []
+    for row in range(10):
+        outer.grid_rowconfigure(row, weight=1)
+        outer.grid_columnconfigure(row, weight=1)
+
+        for column in range(10):
+            tile = Frame(outer)
+            tile.grid(row, column, sticky="nsew")
+            tiles.append(tile)
+
+    root.update_screen()
+
+    tiles[55].configure(bg_color=Color(1, 2, 3, 255))
+    root.calculate_geometry()
+
+    assert root._collect_damage() == [tiles[55].get_abs_rect()]
@@ -0,0 +1,203 @@
+"""
+test_layout.py
+18. October 2026
+
+the layout passes place every widget where the original layout engine did,
+and incremental layouts end up where a fresh one would
+
+Author:
+Nilusink
+"""
+from pginter.widgets import Frame
+from pginter.types import *
+from pginter import PgRoot
+import typing as tp
+import pytest
+import random
+import json
+import os
+
+
+SNAPSHOT: str = os.path.join(os.path.dirname(__file__), "data", "layout_snapshot.json")
+SCENES: tuple[str, ...] = ("grid", "pack", "abs")
+
+
+def build_scene(kind: str) -> PgRoot:
+    """
+    one of the demo scenes (every layout type, nested and with margins and padding)
+    """
+    root = PgRoot(size=(800, 600), headless=True)
+
+    match kind:
+        case "grid":
+            root.set_layout(Grid)
+            root.grid_columnconfigure([0, 1, 2], weight=1)
+            root.grid_rowconfigure([0, 1], weight=1)
+
+            for r in range(2):
+                for c in range(3):
+                    f = Frame(root, layout=Grid if c != 1 else Pack, margin=3, padding=2)
+                    f.grid(r, c, sticky="nsew"[: (r + c) % 4 + 1], margin=4)
+
+                    if c != 1:
+                        f.grid_columnconfigure([0, 1], weight=c + 1)
+                        f.grid_rowconfigure(0, weight=1)
+
+                        for cc in range(2):
+                            g = Frame(f, width=20 + cc * 5, height=15, layout=Pack)
+                            g.grid(0, cc, sticky="ns" if cc else "ew", margin=1)
+                            Frame(g, width=5, height=5).pack(TOP)
+
+                    else:
+                        for anchor in (TOP, LEFT, RIGHT, BOTTOM, TOP):
+                            Frame(f, width=10, height=7).pack(anchor)
+
+        case "pack":
+            root.set_layout(Pack)
+
+            for a in (TOP, LEFT, BOTTOM, RIGHT):
+                f = Frame(root, layout=Pack, margin=2, padding=3)
+                f.pack(a)
+
+                for b in (LEFT, TOP, RIGHT):
+                    g = Frame(f, width=11, height=13, layout=Pack)
+                    g.pack(b)
+                    Frame(g, width=3, height=4).pack(BOTTOM)
+
+        case _:
+            f = Frame(root, width=300, height=200, layout=Absolute)
+            f.place(10, 20)
+            Frame(f, width=30, height=30).place(5, 6)
+
+            p = Frame(root, layout=Pack)
+            p.place(400, 30)
+            Frame(p, width=30, height=40).pack(LEFT)
+            Frame(p, width=30, height=20).pack(LEFT)
+
+    return root
+
+
+def layout_of(node: tp.Any, path: str = "r", out: dict | None = None) -> dict[str, list]:
+    """
+    position and size of every widget below `node`, by its path in the tree
+    """
+    out = {} if out is None else out
+
+    for i, child in enumerate(node.children):
+        out[f"{path}.{i}"] = [round(child._x, 3), round(child._y, 3), list(child.get_size())]
+        layout_of(child, f"{path}.{i}", out)
+
+    return out
+
+
+@pytest.mark.parametrize("kind", SCENES)
+def test_scene_matches_snapshot(kind: str) -> None:
+    root = build_scene(kind)
+    root.update_screen()
+
+    with open(SNAPSHOT) as inp:
+        expected = json.load(inp)[kind]
+
+    assert layout_of(root) == expected
+
+
+@pytest.mark.parametrize("kind", SCENES)
+def test_layout_is_stable(kind: str) -> None:
+    root = build_scene(kind)
+    root.update_screen()
+    first = layout_of(root)
+
+    root.update_screen()
+    assert layout_of(root) == first
+    assert not root.layout_dirty
+
+
+def _random_tree(seed: int) -> tuple[PgRoot, list[Frame], list[tuple]]:
+    """
+    a random tree of pack and absolute containers, the recorded calls rebuild it
+    """
+    rnd = random.Random(seed)
+    root = PgRoot(size=(400, 300), headless=True)
+    frames: list[Frame] = []
+    calls: list[tuple] = []
+
+    def make(parent: tp.Any, parent_index: int, depth: int) -> None:
+        layout = Pack if depth < 3 and rnd.random() < .5 else Absolute
+        kwargs = dict(width=rnd.randint(5, 80), height=rnd.randint(5, 60), layout=layout, padding=rnd.randint(0, 3))
+
+        if getattr(parent, "layout", Absolute) == Pack:
+            placement = ("pack", rnd.choice((TOP, BOTTOM, LEFT, RIGHT)))
+
+        else:
+            placement = ("place", rnd.randint(0, 300), rnd.randint(0, 200))
+
+        calls.append(("new", parent_index, kwargs, placement))
+        frame = Frame(parent, **kwargs)
+        getattr(frame, placement[0])(*placement[1:])
+        frames.append(frame)
+        index = len(frames) - 1
+
+        if depth < 3:
+            for _ in range(rnd.randint(0, 3)):
+                make(frame, index, depth + 1)
+
+    for _ in range(4):
+        make(root, -1, 0)
+
+    return root, frames, calls
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_layout_matches_fresh_layout(seed: int) -> None:
+    """
+    resizing, moving and re-margining widgets of a laid out tree ends up
+    exactly where laying out the final tree from scratch does
+    """
+    rnd = random.Random(seed + 1000)
+    root, frames, calls = _random_tree(seed)
+    root.update_screen()
+
+    # the final configuration of every frame
+    changes: dict[int, dict[str, tp.Any]] = {}
+
+    for _ in range(40):
+        index = rnd.randrange(len(frames))
+        frame = frames[index]
+        option = rnd.choice(("width", "height", "margin", "place"))
+
+        if option == "place":
+            if frame.get_parent().layout != Absolute:
+                continue
+
+            position = (rnd.randint(0, 300), rnd.randint(0, 200))
+            frame.place(*position)
+            changes.setdefault(index, {})["place"] = position
+
+        else:
+            value = rnd.randint(0, 5) if option == "margin" else rnd.randint(5, 80)
+            frame.configure(**{option: value})
+            changes.setdefault(index, {})[option] = value
+
+        if rnd.random() < .3:
+            root.update_screen()
+
+    root.update_screen()
+
+    # build the final tree from scratch
+    fresh = PgRoot(size=(400, 300), headless=True)
+    fresh_frames: list[Frame] = []
+
+    for index, (_new, parent_index, kwargs, placement) in enumerate(calls):
+        change = changes.get(index, {})
+        kwargs = {**kwargs, **{key: value for key, value in change.items() if key != "place"}}
+
+        if "place" in change:
+            placement = ("place", *change["place"])
+
+        frame = Frame(fresh if parent_index < 0 else fresh_frames[parent_index], **kwargs)
+        getattr(frame, placement[0])(*placement[1:])
+        fresh_frames.append(frame)
+
+    fresh.update_screen()
+
+    assert layout_of(root) == layout_of(fresh)